@@ -0,0 +1,188 @@
+# batch_runner.py
+import json
+import logging
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from schedule_model import ScheduleModel
+from solver_runner import INFEASIBLE, kill_process_tree, read_progress_file
+
+BATCH_ROOT = "Data/batch"  # 批量运行的工作目录
+TIMEOUT_GRACE = 30         # 超过time_limit后额外等待的秒数
+
+logger = logging.getLogger(__name__)
+
+# 单个实例的运行结果，status为"完成"/"超时"/"失败"/"已取消"，error为运行出错时的异常信息
+BatchResult = namedtuple("BatchResult", "instance status returncode objective makespan blocks wall_time run_dir error",
+                         defaults=(None,))
+
+
+def prepare_run_dir(instance, settings, run_root=BATCH_ROOT, time_limit=None):
+    """为单个实例准备独立的工作目录与配置文件，返回工作目录
+
+    每个实例使用自己的Data/setting.json与Data/SCC_RES/result.json，
+    算例目录改为绝对路径，互不覆盖。Start/End按[Start, End)理解。
+    """
+    run_dir = os.path.abspath(os.path.join(run_root, f"instance{instance}"))
+    os.makedirs(os.path.join(run_dir, "Data", "SCC_RES"), exist_ok=True)
+
+    run_settings = dict(settings)
+    run_settings.update({
+        "Start": instance,
+        "End": instance + 1,
+        "Last_Ins": instance,
+        "instance_path": os.path.abspath(settings.get("instance_path", "Data/SCC_DATA/")) + os.sep,
+        "result_path": "Data/SCC_RES/result.json",
+    })
+    if time_limit is not None:
+        run_settings["time_limit"] = time_limit
+
+    # 求解器从工作目录下的Data/setting.json读取配置，根目录保留一份副本
+    for path in (os.path.join(run_dir, "Data", "setting.json"), os.path.join(run_dir, "setting.json")):
+        with open(path, "w") as f:
+            json.dump(run_settings, f, indent=4)
+
+    # 清理上次运行的结果，避免误读
+    result_path = os.path.join(run_dir, run_settings["result_path"])
+    if os.path.exists(result_path):
+        os.remove(result_path)
+    return run_dir
+
+
+def collect_result(instance, run_dir, status, returncode, wall_time):
+    """读取工作目录中的结果文件与日志，汇总为BatchResult"""
+    objective = makespan = None
+    blocks = 0
+    result_path = os.path.join(run_dir, "Data", "SCC_RES", "result.json")
+    if os.path.exists(result_path):
+        model = ScheduleModel.from_json(result_path)
+        blocks = len(model)
+        if blocks:
+            makespan = float(model.ends.max())
+
+    # 目标值取日志与标准输出中最后记录的可行值
+    for log_path in (os.path.join(run_dir, "Data", "log.txt"), os.path.join(run_dir, "stdout.txt")):
+        if os.path.exists(log_path):
+            values = [p.objective for p in read_progress_file(log_path) if p.objective < INFEASIBLE]
+            if values:
+                objective = values[-1]
+                break
+    return BatchResult(instance, status, returncode, objective, makespan, blocks, wall_time, run_dir)
+
+
+def run_instance(solver, instance, settings, run_root=BATCH_ROOT, time_limit=None,
+                 grace=TIMEOUT_GRACE, cancel_event=None, on_start=None):
+    """在独立工作目录中运行一个实例，超时或取消时终止进程树"""
+    time_limit = int(time_limit if time_limit is not None else settings.get("time_limit", 60))
+    run_dir = prepare_run_dir(instance, settings, run_root, time_limit)
+    if cancel_event is not None and cancel_event.is_set():
+        return BatchResult(instance, "已取消", None, None, None, 0, 0.0, run_dir)
+
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+
+    started = time.perf_counter()
+    with open(os.path.join(run_dir, "stdout.txt"), "wb") as output:
+        process = subprocess.Popen([os.path.abspath(solver)], cwd=run_dir, stdin=subprocess.DEVNULL,
+                                   stdout=output, stderr=subprocess.STDOUT, **kwargs)
+        if on_start is not None:
+            on_start(instance, process)
+        # cancel()可能在上面的检查之后、进程登记之前执行，登记后再检查一次
+        if cancel_event is not None and cancel_event.is_set():
+            kill_process_tree(process)
+        try:
+            returncode = process.wait(timeout=time_limit + grace)
+            status = "完成" if returncode == 0 else "失败"
+        except subprocess.TimeoutExpired:
+            kill_process_tree(process)
+            returncode = process.wait()
+            status = "超时"
+    if cancel_event is not None and cancel_event.is_set() and status != "完成":
+        status = "已取消"
+    return collect_result(instance, run_dir, status, returncode, time.perf_counter() - started)
+
+
+class BatchRunner:
+    """多实例并行批量运行
+
+    线程池大小默认为CPU核数，每个工作线程负责启动并看管一个求解器进程，
+    因此同时运行的求解器进程数不超过核数。事件通过线程安全队列交给GUI：
+        ("started", 实例号)、("finished", BatchResult)、("done", None)
+    """
+
+    def __init__(self, solver, instances, settings, run_root=BATCH_ROOT, time_limit=None, max_workers=None):
+        self.solver = solver
+        self.instances = list(instances)
+        self.settings = dict(settings)
+        self.run_root = run_root
+        self.time_limit = time_limit
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.events = queue.Queue()
+        self.results = {}
+        self._cancel = threading.Event()
+        self._active = {}  # 实例号 -> 正在运行的进程
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def running(self):
+        return self._executor is not None and len(self.results) < len(self.instances)
+
+    def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = [self._executor.submit(self._run, instance) for instance in self.instances]
+        threading.Thread(target=self._wait_all, args=(pending,), daemon=True).start()
+        return self
+
+    def cancel(self):
+        """取消尚未开始的实例，并终止正在运行的求解器"""
+        self._cancel.set()
+        with self._lock:
+            processes = list(self._active.values())
+        for process in processes:
+            if process.poll() is None:
+                kill_process_tree(process)
+
+    def drain(self, limit=1000):
+        items = []
+        try:
+            while len(items) < limit:
+                items.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
+    def summary(self):
+        """按实例号排序的结果列表"""
+        return [self.results[i] for i in sorted(self.results)]
+
+    def _on_start(self, instance, process):
+        with self._lock:
+            self._active[instance] = process
+        self.events.put(("started", instance))
+
+    def _run(self, instance):
+        try:
+            result = run_instance(self.solver, instance, self.settings, self.run_root, self.time_limit,
+                                  cancel_event=self._cancel, on_start=self._on_start)
+        except Exception as e:
+            logger.exception("批量运行instance%s出错", instance)
+            result = BatchResult(instance, "失败", None, None, None, 0, 0.0, None, f"{type(e).__name__}: {e}")
+        with self._lock:
+            self._active.pop(instance, None)
+        self.results[instance] = result
+        self.events.put(("finished", result))
+
+    def _wait_all(self, pending):
+        for future in pending:
+            future.result()
+        self._executor.shutdown()
+        self.events.put(("done", None))
@@ -0,0 +1,281 @@
+# benchmark.py
+"""SCC算例基准测试（命令行，无需Tk）
+
+示例：
+    python benchmark.py --instances 1-5,8 --time-limits 10 60
+    python benchmark.py --report
+    python benchmark.py --check-references
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from batch_runner import BatchRunner
+from instance_loader import load_instance
+from schedule_evaluator import TIME_UNIT, VIOLATIONS, ScheduleEvaluator
+from schedule_model import ScheduleModel
+
+BENCH_ROOT = "Data/bench"        # 基准测试运行目录
+DATA_DIR = "Data/SCC_DATA"       # 算例目录
+SOLUTION_DIR = "Data/SCC_SOLU"   # 参考解目录
+OBJECTIVE_TOLERANCE = 0.001      # 目标值变差超过该比例视为回归
+TIME_TOLERANCE = 0.10            # 用时增加超过该比例视为变慢
+
+
+def parse_instances(spec):
+    """解析实例范围，如"1-5,8,10-12\""""
+    instances = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            instances.extend(range(int(first), int(last) + 1))
+        else:
+            instances.append(int(part))
+    return sorted(set(instances))
+
+
+def solver_build_id(solver):
+    """求解器可执行文件的内容摘要，用于区分不同版本"""
+    digest = hashlib.sha1()
+    with open(solver, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def makespan_bounds(data):
+    """算例完工时间（秒）的合理范围
+
+    下限为单个炉次按最短加工时间走完工艺路线的时间；上限为所有工序按最长
+    加工时间串行、每道工序都加上最长运输时间，再从最晚的设备可用时间开始。
+    """
+    min_time, max_time = data.process_time[..., 0], data.process_time[..., 2]
+    lower = np.maximum(min_time, 0).sum(axis=1).max()
+    upper = np.maximum(max_time, 0).sum() + (max_time >= 0).sum() * data.transport.max() + data.eat.max()
+    return float(lower * TIME_UNIT), float(upper * TIME_UNIT)
+
+
+def reference_makespan(instance, solution_dir=SOLUTION_DIR, data_dir=DATA_DIR):
+    """参考解的完工时间（秒），没有参考解或完工时间超出算例合理范围
+    （时间单位无法识别）时返回None"""
+    path = os.path.join(solution_dir, f"instance{instance}_sol.json")
+    if not os.path.exists(path):
+        return None
+    model = ScheduleModel.from_json(path)
+    if not len(model):
+        return None
+    makespan = float(model.ends.max())
+    lower, upper = makespan_bounds(load_instance(os.path.join(data_dir, f"instance{instance}.json")))
+    return makespan if lower <= makespan <= upper else None
+
+
+def check_references(instances, data_dir=DATA_DIR, solution_dir=SOLUTION_DIR):
+    """按算例数据评价参考解，返回{实例: 评价结果}，没有参考解的实例跳过
+
+    参考解中浇次计划第一个炉次的第一道工序普遍不在加工时间上下限之内，
+    该任务块不检查加工时间；其余约束都应满足，即各结果的feasible为真。
+    评价结果另含makespan_ok：完工时间是否在makespan_bounds的范围内。
+    """
+    results = OrderedDict()
+    for instance in instances:
+        path = os.path.join(solution_dir, f"instance{instance}_sol.json")
+        if not os.path.exists(path):
+            continue
+        data = load_instance(os.path.join(data_dir, f"instance{instance}.json"))
+        model = ScheduleModel.from_json(path)
+        first_charge = int(data.charge_ids[data.charge_seq == 0][0])
+        evaluator = ScheduleEvaluator(data, model.column("charge"), model.column("machine"),
+                                      unbounded=model.by_charge(first_charge)[:1])
+        result = evaluator.evaluate(model.starts, model.ends)
+        lower, upper = makespan_bounds(data)
+        result["makespan_ok"] = lower <= result["makespan"] <= upper
+        results[instance] = result
+    return results
+
+
+def format_reference_check(results):
+    """格式化参考解检查结果，每个实例一行"""
+    lines = []
+    for instance, result in results.items():
+        violated = [f"{name}={result[name]:g}" for name in VIOLATIONS if result[name] > 0]
+        lines.append(f"instance{instance}: 完工时间={result['makespan']:g}s"
+                     f"{'' if result['makespan_ok'] else '（超出合理范围）'} "
+                     f"{'可行' if result['feasible'] else '不可行 ' + ' '.join(violated)}")
+    return "\n".join(lines)
+
+
+def init_benchmark_table(conn):
+    """创建基准测试结果表"""
+    conn.execute('''CREATE TABLE IF NOT EXISTS benchmark_run
+                    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                     run_at TEXT,
+                     solver_build TEXT,
+                     instance INTEGER,
+                     time_limit INTEGER,
+                     status TEXT,
+                     objective INTEGER,
+                     makespan REAL,
+                     wall_time REAL,
+                     ref_makespan REAL,
+                     makespan_gap REAL)''')
+    conn.execute('''CREATE INDEX IF NOT EXISTS idx_benchmark_run_key
+                    ON benchmark_run(instance, time_limit, id)''')
+    conn.commit()
+
+
+def run_benchmark(solver, instances, time_limits, settings, db_path, workers=None, out=sys.stdout):
+    """运行基准测试并写入数据库，返回本次写入的记录数"""
+    build = solver_build_id(solver)
+    run_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    references = {instance: reference_makespan(instance) for instance in instances}
+
+    conn = sqlite3.connect(db_path)
+    try:
+        init_benchmark_table(conn)
+        written = 0
+        for time_limit in time_limits:
+            print(f"时间限制 {time_limit}s：运行{len(instances)}个实例（求解器版本 {build}）", file=out)
+            batch = BatchRunner(solver, instances, settings, run_root=os.path.join(BENCH_ROOT, f"tl{time_limit}"),
+                                time_limit=time_limit, max_workers=workers).start()
+            while True:
+                kind, result = batch.events.get()
+                if kind == "done":
+                    break
+                if kind != "finished":
+                    continue
+
+                ref = references.get(result.instance)
+                gap = None
+                if ref and result.makespan is not None:
+                    gap = (result.makespan - ref) / ref
+                conn.execute('''INSERT INTO benchmark_run
+                                (run_at, solver_build, instance, time_limit, status, objective,
+                                 makespan, wall_time, ref_makespan, makespan_gap)
+                                VALUES (?,?,?,?,?,?,?,?,?,?)''',
+                             (run_at, build, result.instance, time_limit, result.status, result.objective,
+                              result.makespan, result.wall_time, ref, gap))
+                conn.commit()
+                written += 1
+                print(f"  instance{result.instance}: {result.status} 目标值={result.objective} "
+                      f"完工时间={result.makespan} 用时={result.wall_time:.1f}s", file=out)
+                if result.error:
+                    print(f"    错误：{result.error}", file=out)
+        return written
+    finally:
+        conn.close()
+
+
+def regression_report(conn, objective_tol=OBJECTIVE_TOLERANCE, time_tol=TIME_TOLERANCE):
+    """按(实例, 时间限制)比较最近一次运行与之前的基线
+
+    基线取最近一次运行之前、不同求解器版本的最后一次完成记录；
+    没有其他版本时取同版本的上一次记录。
+    """
+    rows = conn.execute('''SELECT instance, time_limit, solver_build, run_at, objective, wall_time,
+                                  makespan, ref_makespan
+                           FROM benchmark_run
+                           WHERE status = '完成'
+                           ORDER BY instance, time_limit, id''').fetchall()
+    history = OrderedDict()
+    for row in rows:
+        history.setdefault((row[0], row[1]), []).append(row)
+
+    report = []
+    for (instance, time_limit), runs in history.items():
+        latest = runs[-1]
+        previous = runs[:-1]
+        baseline = next((r for r in reversed(previous) if r[2] != latest[2]), previous[-1] if previous else None)
+
+        flags = []
+        objective_delta = time_delta = None
+        if baseline is not None:
+            if latest[4] is not None and baseline[4]:
+                objective_delta = (latest[4] - baseline[4]) / baseline[4]
+                if objective_delta > objective_tol:
+                    flags.append("变差")
+            if latest[5] is not None and baseline[5]:
+                time_delta = (latest[5] - baseline[5]) / baseline[5]
+                if time_delta > time_tol:
+                    flags.append("变慢")
+        ref_gap = None
+        if latest[6] is not None and latest[7]:
+            ref_gap = (latest[6] - latest[7]) / latest[7]
+
+        report.append({
+            "instance": instance,
+            "time_limit": time_limit,
+            "build": latest[2],
+            "baseline_build": baseline[2] if baseline else None,
+            "objective": latest[4],
+            "objective_delta": objective_delta,
+            "wall_time": latest[5],
+            "time_delta": time_delta,
+            "ref_gap": ref_gap,
+            "flags": flags,
+        })
+    return report
+
+
+def format_report(report):
+    """格式化回归报告为文本表格"""
+    def pct(value):
+        return "-" if value is None else f"{value * 100:+.2f}%"
+
+    lines = [f"{'实例':<12}{'时限':>6}{'版本':>14}{'目标值':>12}{'目标变化':>10}"
+             f"{'用时':>9}{'用时变化':>10}{'参考差距':>10}  结论"]
+    for item in report:
+        wall_time = "-" if item["wall_time"] is None else f"{item['wall_time']:.1f}"
+        lines.append(
+            f"{'instance' + str(item['instance']):<12}{item['time_limit']:>6}{item['build']:>14}"
+            f"{str(item['objective']):>12}{pct(item['objective_delta']):>10}{wall_time:>9}"
+            f"{pct(item['time_delta']):>10}{pct(item['ref_gap']):>10}  {'、'.join(item['flags']) or '正常'}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SCC算例基准测试与回归跟踪")
+    parser.add_argument("--instances", default="1-30", help="实例范围，如 1-5,8")
+    parser.add_argument("--time-limits", type=int, nargs="+", default=[60], help="时间限制（秒），可多个")
+    parser.add_argument("--solver", default="main.exe", help="求解器可执行文件")
+    parser.add_argument("--settings", default="Data/setting.json", help="基础配置文件")
+    parser.add_argument("--db", default="steel_production.db", help="结果数据库")
+    parser.add_argument("--workers", type=int, default=None, help="并行进程数，默认CPU核数")
+    parser.add_argument("--report", action="store_true", help="只输出回归报告，不运行求解器")
+    parser.add_argument("--check-references", action="store_true",
+                        help="只检查参考解是否满足算例约束，不运行求解器")
+    args = parser.parse_args(argv)
+
+    if args.check_references:
+        results = check_references(parse_instances(args.instances))
+        print(format_reference_check(results))
+        passed = all(result["feasible"] and result["makespan_ok"] for result in results.values())
+        return 0 if passed else 1
+
+    if not args.report:
+        with open(args.settings) as f:
+            settings = json.load(f)
+        run_benchmark(args.solver, parse_instances(args.instances), args.time_limits, settings,
+                      args.db, workers=args.workers)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        init_benchmark_table(conn)
+        print(format_report(regression_report(conn)))
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
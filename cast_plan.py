@@ -0,0 +1,143 @@
+# cast_plan.py
+import xml.etree.ElementTree as ET
+
+import data_access
+from codebook import Codebook
+
+EXPORT_BATCH_SIZE = 5000  # 每批executemany写入的行数
+HEAT_ATTRIBUTES = ("orderNo", "chargeNo", "minLength", "maxLength")  # CastPlan保存的钢水属性
+
+
+def iter_cast_plan(path):
+    """流式解析castInput.xml，逐个产出(浇次属性, 炉次属性, 钢水属性)
+
+    每个Cast处理完后立即清理，内存占用与文件大小无关。
+    """
+    context = ET.iterparse(path, events=("start", "end"))
+    _, root = next(context)
+    cast_attrib = charge_attrib = None
+
+    for event, elem in context:
+        if event == "start":
+            if elem.tag == "Cast":
+                cast_attrib = elem.attrib
+            elif elem.tag == "Charge":
+                charge_attrib = elem.attrib
+        elif elem.tag == "Heat":
+            yield cast_attrib, charge_attrib, elem.attrib
+        elif elem.tag == "Cast":
+            elem.clear()
+            root.clear()
+
+
+class CastPlan:
+    """浇次计划的紧凑存储，供浇次树按需展开
+
+    一次流式解析得到各浇次的炉次与钢水，只保存界面需要的字段，并做字典编码：
+      strings      属性字符串，相同的字符串只保存一份
+      heats        不同的钢水(orderNo, chargeNo, minLength, maxLength)，以编码引用
+      heat_groups  不同的炉次钢水组合（钢水编码的元组），各炉次重复的组合只保存一份
+      charge_num   各浇次的chargeNum属性
+      charges      各浇次的炉次列表[(lgSt, realLength, 钢水组合编码)]
+      heat_count   各浇次的钢水数
+      real_length  各浇次炉次realLength之和
+    """
+
+    def __init__(self):
+        self.strings = Codebook()
+        self.heats = Codebook()
+        self.heat_groups = Codebook()
+        self.charge_num = []
+        self.charges = []
+        self.heat_count = []
+        self.real_length = []
+
+    def __len__(self):
+        return len(self.charges)
+
+    def charge_heats(self, cast, charge):
+        """第cast个浇次中第charge个炉次的钢水[(orderNo, chargeNo, minLength, maxLength)]"""
+        return self.heats.decode(self.heat_groups[self.charges[cast][charge][2]])
+
+    @classmethod
+    def from_xml(cls, path):
+        """流式解析castInput.xml，每个Cast处理完后立即清理"""
+        plan = cls()
+        intern = plan.strings.intern
+        context = ET.iterparse(path, events=("start", "end"))
+        _, root = next(context)
+        charges = heats = None
+
+        for event, elem in context:
+            if event == "start":
+                if elem.tag == "Cast":
+                    charges = []
+                elif elem.tag == "Charge":
+                    heats = []
+            elif elem.tag == "Heat":
+                heats.append(plan.heats.encode(tuple(intern(elem.get(name)) for name in HEAT_ATTRIBUTES)))
+            elif elem.tag == "Charge":
+                charges.append((intern(elem.get("lgSt")), _to_int(elem.get("realLength")),
+                                plan.heat_groups.encode(tuple(heats))))
+            elif elem.tag == "Cast":
+                plan.charge_num.append(intern(elem.get("chargeNum")))
+                plan.charges.append(charges)
+                plan.heat_count.append(sum(len(plan.heat_groups[charge[2]]) for charge in charges))
+                plan.real_length.append(sum(charge[1] for charge in charges))
+                # 释放已处理的节点
+                elem.clear()
+                root.clear()
+        return plan
+
+
+def _to_int(text):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return 0
+
+
+def export_cast_plan(xml_path, db=None, batch_size=EXPORT_BATCH_SIZE):
+    """批量导出浇次计划到cast_plan表
+
+    流式读取XML，按批executemany写入，整个导入在连接池的一个事务中完成，
+    db为DataAccess，默认使用共享的数据库访问层。
+    返回统计信息：heats为读取的钢水数，rows为写入后表中对应的记录数
+    （heat_id相同的钢水会互相覆盖），casts/charges为浇次与炉次数量。
+    """
+    stats = {"heats": 0, "rows": 0, "casts": 0, "charges": 0}
+    sql = "INSERT OR REPLACE INTO cast_plan VALUES (?,?,?,?,?,?)"
+    db = db or data_access.shared()
+    heat_ids = set()
+
+    with db.transaction() as conn:  # 单个事务，异常时整体回滚
+        batch = []
+        last_cast = last_charge = None
+        for cast, charge, heat in iter_cast_plan(xml_path):
+            if cast is not last_cast:
+                stats["casts"] += 1
+                last_cast = cast
+            if charge is not last_charge:
+                stats["charges"] += 1
+                last_charge = charge
+
+            heat_id = heat.get("chargeNo")
+            heat_ids.add(heat_id)
+            batch.append((
+                heat_id,
+                cast.get("chargeNum"),
+                charge.get("lgSt"),
+                heat.get("orderNo"),
+                heat.get("minLength"),
+                heat.get("maxLength")
+            ))
+            if len(batch) >= batch_size:
+                conn.executemany(sql, batch)
+                stats["heats"] += len(batch)
+                batch = []
+        if batch:
+            conn.executemany(sql, batch)
+            stats["heats"] += len(batch)
+
+    stats["rows"] = len(heat_ids)
+    return stats
@@ -0,0 +1,34 @@
+# codebook.py
+
+
+class Codebook:
+    """字典编码：相同的值只保存一次，以整数编码引用
+
+    值必须可哈希（字符串、元组等）。编码按首次出现的顺序从0分配，
+    values[code]即对应的值；intern返回已保存的同值对象，
+    使重复出现的字符串或元组在内存中只有一份。
+    """
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+    def encode(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def intern(self, value):
+        return self.values[self.encode(value)]
+
+    def decode(self, codes):
+        values = self.values
+        return [values[code] for code in codes]
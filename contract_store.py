@@ -0,0 +1,213 @@
+# contract_store.py
+import hashlib
+import os
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+
+import data_access
+from edit_journal import XmlRecordJournal
+
+CONTRACT_XML = "FurnaceResult2.xml"
+CONTRACT_TABLE = "contract"
+SCHEMA_VERSION = 2  # 字段或类型变化时递增，旧表自动重建
+
+# 合同字段与列类型（列名即XML标签，文件末尾的FurnaceGeneral汇总不导入）
+CONTRACT_COLUMNS = (
+    ("SM_DIV", "INTEGER"),
+    ("HR_DIV", "INTEGER"),
+    ("FURNACE_NO", "TEXT"),
+    ("FURNACE_AVAILABLE_CC_LIST", "TEXT"),
+    ("ORDER_AVAILABLE_CC_LIST", "TEXT"),
+    ("FURNACE_WT", "INTEGER"),
+    ("IS_FULL", "INTEGER"),
+    ("ORDER_NO", "TEXT"),
+    ("IS_NECESSARY_ORDER", "INTEGER"),
+    ("ORDER_DELIVY_DATE_TYPE_PRIORITY", "INTEGER"),
+    ("ORDER_DELIVERY_TIME_PRIORITY", "INTEGER"),
+    ("IS_FURNACE_WIDTH_JUMP", "INTEGER"),
+    ("FURNACE_WIDTH_MAX", "INTEGER"),
+    ("FURNACE_WIDTH_MIN", "INTEGER"),
+    ("ORDER_WIDTH_MAX", "INTEGER"),
+    ("ORDER_WIDTH_MIN", "INTEGER"),
+    ("SLAB_NUM", "INTEGER"),
+    ("SLAB_PRE_WT", "INTEGER"),
+    ("SLAB_TOTAL_WT", "INTEGER"),
+    ("ORDER_FINAL_DEST", "TEXT"),
+    ("ST_NO_SPEC", "TEXT"),
+    ("REFINE_DIV", "TEXT"),
+    ("LG_ST", "TEXT"),
+    ("SLAB_DEST", "TEXT"),  # 带前导零的代码，按文本保存
+    ("IS_RH_DEEP", "INTEGER"),
+    ("RH_OR_LF", "TEXT"),
+    ("UNIT_MAJOR", "TEXT"),
+)
+CONTRACT_FIELDS = tuple(name for name, _ in CONTRACT_COLUMNS)
+
+# 查询使用的索引：(索引名, 列)
+CONTRACT_INDEXES = (
+    ("idx_contract_lg_st", "LG_ST"),
+    ("idx_contract_order_no", "ORDER_NO"),
+    ("idx_contract_furnace_no", "FURNACE_NO"),
+    ("idx_contract_unit_major", "UNIT_MAJOR"),
+    ("idx_contract_width", "FURNACE_WIDTH_MIN, FURNACE_WIDTH_MAX"),
+)
+
+# 在大量记录中重复出现的文本字段，查询结果中同值只保留一个字符串对象
+REPEATED_FIELDS = frozenset((
+    "FURNACE_AVAILABLE_CC_LIST", "ORDER_AVAILABLE_CC_LIST", "ORDER_FINAL_DEST", "ST_NO_SPEC",
+    "REFINE_DIV", "LG_ST", "SLAB_DEST", "RH_OR_LF", "UNIT_MAJOR",
+))
+
+_sync_lock = threading.Lock()  # 避免多个线程同时导入同一文件
+
+
+def iter_furnace_results(path, fields, missing="N/A"):
+    """流式解析FurnaceResult XML，逐条产出所需字段的元组
+
+    使用iterparse边读边解析，每条记录处理完后立即清理，
+    内存占用与文件大小无关。缺失字段返回missing。
+    """
+    positions = {tag: i for i, tag in enumerate(fields)}
+    context = ET.iterparse(path, events=("start", "end"))
+    _, root = next(context)
+    values = [missing] * len(fields)
+
+    for event, elem in context:
+        if event != "end":
+            continue
+        tag = elem.tag
+        if tag in positions:
+            values[positions[tag]] = elem.text
+        elif tag == "FurnaceResult":
+            yield tuple(values)
+            values = [missing] * len(fields)
+            # 释放已处理的节点
+            elem.clear()
+            root.clear()
+
+
+def sync(path=CONTRACT_XML, db=None):
+    """保证contract表与合同XML及其编辑日志一致，返回是否有变化
+
+    contract_source记录已导入文件的修改时间、大小与SHA1：修改时间与大小一致时
+    直接使用；不一致但内容摘要相同（如文件被复制或touch）时只刷新记录；
+    否则在一个事务中清空并重新导入。row_no为记录的顺序。
+    编辑日志记录已应用到的位置，之后只应用新追加的编辑。
+    """
+    db = db or data_access.shared()
+    journal = XmlRecordJournal(path)
+    stat = os.stat(path)
+    with _sync_lock:
+        _ensure_schema(db)
+        source = db.query_one("SELECT path, mtime_ns, size, sha1, journal_offset FROM contract_source WHERE id=1")
+        unchanged = source is not None and source[0] == path and source[1:3] == (stat.st_mtime_ns, stat.st_size)
+        digest = source[3] if unchanged else _file_sha1(path)
+        reload = source is None or source[0] != path or source[3] != digest
+        offset = 0 if reload else source[4]
+        entries, end = journal.read(offset)
+        if end < offset:
+            # 日志已失效（原文件在外部被修改），表中可能含有日志中的编辑，重新导入
+            reload, entries, end = True, [], 0
+        if unchanged and not reload and not entries:
+            return False
+
+        with db.transaction() as conn:
+            if reload:
+                conn.execute(f"DELETE FROM {CONTRACT_TABLE}")
+                _insert(conn, iter_furnace_results(path, CONTRACT_FIELDS, missing=None))
+            for entry in entries:
+                if entry["op"] == "add":
+                    _insert(conn, [tuple(entry["record"].get(f) for f in CONTRACT_FIELDS)])
+                else:
+                    conn.execute(f"""DELETE FROM {CONTRACT_TABLE} WHERE row_no =
+                                     (SELECT row_no FROM {CONTRACT_TABLE} ORDER BY row_no LIMIT 1 OFFSET ?)""",
+                                 (entry["index"],))
+            conn.execute("INSERT OR REPLACE INTO contract_source VALUES (1, ?, ?, ?, ?, ?, ?)",
+                         (path, stat.st_mtime_ns, stat.st_size, digest, end, SCHEMA_VERSION))
+        return reload or bool(entries)
+
+
+def positions(row_nos, db=None):
+    """contract表中各row_no对应记录在记录列表中的下标（用于编辑日志）"""
+    db = db or data_access.shared()
+    return [db.query_one(f"SELECT COUNT(*) FROM {CONTRACT_TABLE} WHERE row_no < ?", (row_no,))[0]
+            for row_no in row_nos]
+
+
+def query(db=None, fields=CONTRACT_FIELDS, lg_st=None, order_no=None, furnace_no=None,
+          unit_major=None, width=None, missing=None):
+    """按条件查询合同记录，返回fields对应的元组列表（按XML中的顺序）
+
+    lg_st/order_no/furnace_no/unit_major为等值条件，可传入单个值或列表；
+    width为(最小, 最大)，选出炉次宽度范围与之有交集的记录。
+    missing不为None时用它代替空值。REPEATED_FIELDS中的字段在结果中共用字符串对象。
+    """
+    db = db or data_access.shared()
+    conditions, params = [], []
+    for column, value in (("LG_ST", lg_st), ("ORDER_NO", order_no),
+                          ("FURNACE_NO", furnace_no), ("UNIT_MAJOR", unit_major)):
+        if value is None:
+            continue
+        values = [value] if isinstance(value, (str, int)) else list(value)
+        conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+    if width is not None:
+        conditions.append("FURNACE_WIDTH_MIN <= ? AND FURNACE_WIDTH_MAX >= ?")
+        params.extend((width[1], width[0]))
+
+    if missing is None:
+        select = ", ".join(fields)
+    else:
+        select = ", ".join(f"IFNULL({f}, ?)" for f in fields)
+        params = [missing] * len(fields) + params
+    sql = f"SELECT {select} FROM {CONTRACT_TABLE}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    rows = db.query(sql + " ORDER BY row_no", params)
+
+    repeated = [i for i, field in enumerate(fields) if field in REPEATED_FIELDS]
+    if not repeated:
+        return rows
+    pool = {}  # 同值字符串只保留第一次出现的对象
+    result = []
+    for row in rows:
+        row = list(row)
+        for i in repeated:
+            row[i] = pool.setdefault(row[i], row[i])
+        result.append(tuple(row))
+    return result
+
+
+def _insert(conn, rows):
+    columns = ", ".join(CONTRACT_FIELDS)
+    placeholders = ", ".join("?" * len(CONTRACT_FIELDS))
+    # 数值列的INTEGER亲和性会把数字文本存为整数
+    conn.executemany(f"INSERT INTO {CONTRACT_TABLE}({columns}) VALUES ({placeholders})", rows)
+
+
+def _ensure_schema(db):
+    """建立contract表、索引与导入记录，表结构版本不符时重建"""
+    with db.transaction() as conn:
+        try:
+            version = conn.execute("SELECT schema_version FROM contract_source WHERE id=1").fetchone()
+        except sqlite3.OperationalError:
+            version = None
+        if version is not None and version[0] != SCHEMA_VERSION:
+            conn.execute(f"DROP TABLE IF EXISTS {CONTRACT_TABLE}")
+            conn.execute("DROP TABLE contract_source")
+        conn.execute("""CREATE TABLE IF NOT EXISTS contract_source
+                        (id INTEGER PRIMARY KEY, path TEXT, mtime_ns INTEGER, size INTEGER,
+                         sha1 TEXT, journal_offset INTEGER, schema_version INTEGER)""")
+        columns = ", ".join(f"{name} {kind}" for name, kind in CONTRACT_COLUMNS)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {CONTRACT_TABLE} (row_no INTEGER PRIMARY KEY, {columns})")
+        for name, columns in CONTRACT_INDEXES:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {CONTRACT_TABLE}({columns})")
+
+
+def _file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,164 @@
+# cp_log.py
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from solver_runner import LOG_ENCODING
+
+CP_LOG_DIR = "Data/cpLog"
+SCAN_WORKERS = 8
+
+# 日志文件名：instanceN log [-变体]，例如instance1log、instance1log-Diff100-cpLs
+LOG_NAME = re.compile(r"instance(\d+)log(?:-(.+))?$")
+
+# 直接在GBK字节上匹配，不逐行解码（全角字符是多字节，不能放进字符类）：
+#   当前时间为：15.424当前目标值为451030   当前目标值的Gap为9.97716e-05
+#   430300 1.35938（部分变体只输出"目标值 时间"）
+CP_LINE = re.compile(
+    "当前时间为(?:：|:)?([\\d.]+)\\s*当前目标值为(\\d+)\\s*当前目标值的Gap为([\\d.eE+-]+)".encode(LOG_ENCODING)
+    + rb"|^(\d+)[ \t]+([\d.]+)\r?$",
+    re.MULTILINE,
+)
+
+_cache = {}  # 路径 -> ((修改时间, 大小), 解析结果)
+_cache_lock = threading.Lock()
+
+
+def parse_log(path):
+    """解析一个CP日志文件，返回(时间, 目标值, Gap)三个数组，缺失的Gap为NaN
+
+    按文件修改时间与大小缓存，文件未变时直接返回缓存结果。
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with open(path, "rb") as f:
+        data = f.read()
+    rows = [(time or pair_time, objective or pair_objective, gap or b"nan")
+            for time, objective, gap, pair_objective, pair_time in CP_LINE.findall(data)]
+    if rows:
+        times, objectives, gaps = zip(*rows)
+    else:
+        times = objectives = gaps = ()
+    result = (np.array(times, dtype=float), np.array(objectives, dtype=np.int64), np.array(gaps, dtype=float))
+    with _cache_lock:
+        _cache[path] = (signature, result)
+    return result
+
+
+class CpLogTable:
+    """所有CP日志的列式数据
+
+    每个点一行，各列为等长数组：instance、variant（variants中的下标）、
+    time、objective、gap。行按(实例, 变体, 时间)排序，同一条日志的点连续存放，
+    series给出每条日志的(实例, 变体)与行范围。
+    """
+
+    def __init__(self, instance, variant, time, objective, gap, variants):
+        order = np.lexsort((time, variant, instance))
+        self.instance = instance[order]
+        self.variant = variant[order]
+        self.time = time[order]
+        self.objective = objective[order]
+        self.gap = gap[order]
+        self.variants = variants  # 变体名称，""为默认的CP求解日志
+
+        # 每条日志（实例, 变体）在行中的起止位置
+        group = self.instance.astype(np.int64) * len(variants) + self.variant
+        boundary = np.flatnonzero(np.diff(group)) + 1
+        self.starts = np.concatenate(([0], boundary)) if len(group) else np.empty(0, dtype=np.intp)
+        self.ends = np.append(boundary, len(group)) if len(group) else np.empty(0, dtype=np.intp)
+        self.group = np.repeat(np.arange(len(self.starts)), self.ends - self.starts)
+
+    def __len__(self):
+        return len(self.time)
+
+    @property
+    def series(self):
+        """[(实例, 变体名称, 起始行, 结束行)]"""
+        return [(int(self.instance[s]), self.variants[self.variant[s]], int(s), int(e))
+                for s, e in zip(self.starts, self.ends)]
+
+    def best_objective(self):
+        """各实例在所有日志中的最优目标值，返回{实例: 目标值}"""
+        if not len(self):
+            return {}
+        order = np.argsort(self.instance, kind="stable")
+        instances, first = np.unique(self.instance[order], return_index=True)
+        best = np.minimum.reduceat(self.objective[order], first)
+        return dict(zip(instances.tolist(), best.tolist()))
+
+    def time_to_target(self, targets=None, tolerance=0.0):
+        """每条日志首次达到目标值（不超过目标×(1+tolerance)）的时间，未达到为NaN
+
+        targets为{实例: 目标值}，默认取各实例在所有日志中的最优值。
+        返回与series顺序一致的数组。
+        """
+        if not len(self.starts):
+            return np.empty(0)
+        targets = targets or self.best_objective()
+        lookup = np.array([targets.get(i, -1) for i in self.instance.tolist()], dtype=float)
+        reached = self.objective <= lookup * (1 + tolerance)
+        hit_time = np.where(reached, self.time, np.inf)
+        first = np.minimum.reduceat(hit_time, self.starts)
+        return np.where(np.isinf(first), np.nan, first)
+
+    def gap_curves(self, grid):
+        """各条日志在时间网格grid上的Gap（取不晚于该时刻的最后一个点），返回(日志数, 网格点数)数组
+
+        所有日志一次searchsorted：按(日志序号, 时间)组合为单调递增的键。
+        """
+        grid = np.asarray(grid, dtype=float)
+        n = len(self.starts)
+        if not n:
+            return np.empty((0, len(grid)))
+        low = min(self.time.min(), grid.min())
+        span = max(self.time.max(), grid.max()) - low + 1
+        keys = self.group * span + (self.time - low)
+        queries = np.arange(n)[:, None] * span + (grid - low)[None, :]
+        index = np.searchsorted(keys, queries, side="right") - 1
+        before_first = index < self.starts[:, None]
+        curves = self.gap[np.maximum(index, 0)]
+        curves[before_first] = np.nan
+        return curves
+
+    def summary_lines(self):
+        """与readCpLog.cpp的testNote.txt相同的格式：实例名 点数 各点Gap..."""
+        lines = []
+        for (instance, variant, start, end) in self.series:
+            name = f"instance{instance}" + (f"-{variant}" if variant else "")
+            gaps = " ".join(f"{gap:g}" for gap in self.gap[start:end])
+            lines.append(f"{name} {end - start} {gaps}")
+        return lines
+
+
+def scan(root=CP_LOG_DIR, workers=SCAN_WORKERS):
+    """并行解析root下（含子目录）所有instanceN log文件，返回CpLogTable"""
+    files = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            match = LOG_NAME.match(name)
+            if match:
+                files.append((os.path.join(directory, name), int(match.group(1)), match.group(2) or ""))
+    files.sort()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as pool:
+        parsed = list(pool.map(parse_log, [path for path, _, _ in files]))
+
+    variants = sorted({variant for _, _, variant in files})
+    code = {variant: i for i, variant in enumerate(variants)}
+    counts = [len(times) for times, _, _ in parsed]
+    instance = np.repeat([instance for _, instance, _ in files], counts).astype(np.int32)
+    variant = np.repeat([code[variant] for _, _, variant in files], counts).astype(np.int32)
+
+    def column(i, dtype):
+        return np.concatenate([p[i] for p in parsed]) if parsed else np.empty(0, dtype=dtype)
+
+    return CpLogTable(instance, variant, column(0, float), column(1, np.int64), column(2, float), variants)
@@ -0,0 +1,179 @@
+# data_access.py
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+DB_PATH = "steel_production.db"
+POOL_SIZE = 4               # 连接池大小
+READ_WORKERS = 2            # 后台读取线程数
+STATEMENT_CACHE_SIZE = 256  # 每个连接缓存的预编译语句数
+SLOW_QUERY_MS = 100         # 超过该耗时（毫秒）的语句记为慢查询
+
+# 每个连接建立时执行的参数
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+    # INSERT OR REPLACE删除旧行时触发删除触发器，保持全文索引同步
+    "PRAGMA recursive_triggers=ON",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """SQLite连接池
+
+    连接在首次需要时建立，最多size个，用完归还；池空时等待其他线程归还。
+    WAL模式下读连接互不阻塞，写操作由SQLite的busy_timeout排队。
+    """
+
+    def __init__(self, path=DB_PATH, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._all = []
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        return self._idle.get()
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all = []
+            self._created = 0
+            self._idle = queue.LifoQueue()
+
+
+class DataAccess:
+    """数据库访问层：连接池、语句计时与后台读取
+
+    所有SQL都经过query/execute，参数化语句由连接的语句缓存复用。
+    开启计时后，耗时超过slow_ms的语句连同耗时写入日志并保留在slow_queries中。
+    submit/query_async在线程池中执行，返回Future，由调用方在GUI线程轮询结果。
+    """
+
+    def __init__(self, path=DB_PATH, pool_size=POOL_SIZE, workers=READ_WORKERS):
+        self.path = path
+        self.pool = ConnectionPool(path, pool_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-read")
+        self.tracing = True
+        self.slow_ms = SLOW_QUERY_MS
+        self.slow_queries = deque(maxlen=200)  # (耗时毫秒, SQL, 参数)
+
+    def set_tracing(self, enabled, slow_ms=None):
+        """开关慢查询计时，slow_ms为0时记录所有语句"""
+        self.tracing = enabled
+        if slow_ms is not None:
+            self.slow_ms = slow_ms
+
+    # ----------------- 同步接口 -----------------
+    def query(self, sql, params=()):
+        """执行查询并返回全部行"""
+        with self.pool.connection() as conn:
+            return self._timed(sql, params, lambda: conn.execute(sql, params).fetchall())
+
+    def query_one(self, sql, params=()):
+        with self.pool.connection() as conn:
+            return self._timed(sql, params, lambda: conn.execute(sql, params).fetchone())
+
+    def execute(self, sql, params=()):
+        """在单独事务中执行一条写语句，返回影响的行数"""
+        with self.transaction() as conn:
+            return self._timed(sql, params, lambda: conn.execute(sql, params).rowcount)
+
+    def executemany(self, sql, seq_of_params):
+        with self.transaction() as conn:
+            return self._timed(sql, (), lambda: conn.executemany(sql, seq_of_params).rowcount)
+
+    @contextmanager
+    def transaction(self):
+        """取出一个连接并在事务中执行，正常结束提交，异常回滚"""
+        with self.pool.connection() as conn:
+            with conn:
+                yield conn
+
+    def columns(self, table):
+        """表的列名列表"""
+        return [row[1] for row in self.query(f"PRAGMA table_info({table})")]
+
+    def primary_key(self, table):
+        """表的主键列名，没有显式主键时返回rowid"""
+        keys = [row[1] for row in self.query(f"PRAGMA table_info({table})") if row[5]]
+        return keys[0] if len(keys) == 1 else "rowid"
+
+    # ----------------- 后台接口 -----------------
+    def submit(self, fn, *args, **kwargs):
+        """在读取线程池中执行fn，返回Future"""
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def query_async(self, sql, params=()):
+        return self.submit(self.query, sql, params)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.pool.close()
+
+    def _timed(self, sql, params, run):
+        if not self.tracing:
+            return run()
+        started = time.perf_counter()
+        try:
+            return run()
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            if elapsed >= self.slow_ms:
+                statement = " ".join(sql.split())
+                self.slow_queries.append((elapsed, statement, params))
+                logger.warning("慢查询 %.1fms: %s %r", elapsed, statement, params)
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared(path=DB_PATH):
+    """同一数据库文件在进程内共用一个DataAccess"""
+    with _shared_lock:
+        if path not in _shared:
+            _shared[path] = DataAccess(path)
+        return _shared[path]
@@ -0,0 +1,215 @@
+# edit_journal.py
+import abc
+import json
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+JOURNAL_SUFFIX = ".journal"
+COMPACT_BYTES = 256 * 1024  # 日志超过该大小时合并回原文件
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path):
+    with _locks_guard:
+        return _locks.setdefault(os.path.abspath(path), threading.RLock())
+
+
+class EditJournal(abc.ABC):
+    """记录列表的追加式编辑日志
+
+    对原文件中记录列表的添加与删除不改写原文件，而是作为一行JSON追加到
+    旁边的.journal文件（每次编辑只写入编辑本身），读取时在原文件的记录上依次重放：
+      {"op": "add", "record": {...}}    在末尾追加一条记录
+      {"op": "delete", "index": i}      删除当前第i条记录
+    日志第一行记录原文件的大小与修改时间，原文件被替换或在外部修改后日志自动失效。
+    合并（compact）把重放结果写入临时文件后原子替换原文件，再删除日志；
+    进程在任何时刻中断，原文件都保持完整，末尾写了一半的日志行在读取时忽略。
+    子类实现_load与_write，对应具体的文件格式。
+    """
+
+    def __init__(self, base_path, compact_bytes=COMPACT_BYTES):
+        self.base_path = base_path
+        self.path = base_path + JOURNAL_SUFFIX
+        self.compact_bytes = compact_bytes
+        self.lock = _lock_for(base_path)
+
+    # ----------------- 写入 -----------------
+    def add(self, record):
+        self._append([{"op": "add", "record": record}])
+
+    def delete(self, indexes):
+        """删除当前下标为indexes的记录（逆序写入，避免下标错位）"""
+        self._append([{"op": "delete", "index": int(i)} for i in sorted(set(indexes), reverse=True)])
+
+    def _append(self, entries):
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with self.lock:
+            header = self._header()
+            mode = "a" if self._is_current(header) else "w"
+            if mode == "a":
+                self._drop_partial_line()
+            with open(self.path, mode, encoding="utf-8") as f:
+                if mode == "w":
+                    f.write(json.dumps({"base": self._base_signature()}) + "\n")
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+    # ----------------- 读取 -----------------
+    def read(self, offset=0):
+        """读取offset（字节）之后的编辑，返回(编辑列表, 读到的位置)
+
+        offset为0时从头读取；日志不存在或已失效时返回([], 0)。
+        """
+        with self.lock:
+            if not self._is_current(self._header()):
+                return [], 0
+            entries = []
+            with open(self.path, "rb") as f:
+                if offset == 0:
+                    f.readline()  # 跳过文件头
+                    offset = f.tell()
+                else:
+                    f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # 未写完的最后一行
+                    entries.append(json.loads(line))
+                    offset = f.tell()
+            return entries, offset
+
+    def records(self):
+        """原文件的记录叠加日志后的结果"""
+        with self.lock:
+            return self.replay(self._load(), self.read()[0])
+
+    @staticmethod
+    def replay(records, entries):
+        for entry in entries:
+            if entry["op"] == "add":
+                records.append(entry["record"])
+            else:
+                del records[entry["index"]]
+        return records
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def needs_compaction(self):
+        return self.size() > self.compact_bytes
+
+    # ----------------- 合并 -----------------
+    def compact(self):
+        """把日志合并进原文件，返回合并的编辑数"""
+        with self.lock:
+            entries = self.read()[0]
+            if entries:
+                temp = self.base_path + ".tmp"
+                try:
+                    self._write(temp, entries)
+                    os.replace(temp, self.base_path)
+                finally:
+                    if os.path.exists(temp):
+                        os.remove(temp)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return len(entries)
+
+    # ----------------- 内部 -----------------
+    def _base_signature(self):
+        stat = os.stat(self.base_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _header(self):
+        try:
+            with open(self.path, "rb") as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+    def _drop_partial_line(self):
+        """截掉上次中断时写了一半的最后一行，避免与新追加的行连在一起"""
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            data = f.read()
+            f.seek(data.rfind(b"\n") + 1)
+            f.truncate()
+
+    def _is_current(self, header):
+        return header is not None and header.get("base") == self._base_signature()
+
+    @abc.abstractmethod
+    def _load(self):
+        """读取原文件中的记录列表"""
+
+    @abc.abstractmethod
+    def _write(self, path, entries):
+        """把原文件叠加entries后写入path（写完并落盘）"""
+
+
+class XmlRecordJournal(EditJournal):
+    """FurnaceResult2.xml中FurnaceResult记录的编辑日志，记录为{标签: 文本}"""
+
+    tag = "FurnaceResult"
+
+    def _load(self):
+        root = ET.parse(self.base_path).getroot()
+        return [{child.tag: child.text for child in elem} for elem in root.iter(self.tag)]
+
+    def _write(self, path, entries):
+        tree = ET.parse(self.base_path)
+        root = tree.getroot()
+        elements = list(root.iter(self.tag))
+        for entry in entries:
+            if entry["op"] == "add":
+                elem = ET.Element(self.tag)
+                for tag, value in entry["record"].items():
+                    ET.SubElement(elem, tag).text = value
+                # 新记录排在最后一条记录之后（汇总节点之前）
+                position = list(root).index(elements[-1]) + 1 if elements else len(root)
+                root.insert(position, elem)
+                elements.append(elem)
+            else:
+                root.remove(elements.pop(entry["index"]))
+        ET.indent(tree, space="  ")
+        with open(path, "wb") as f:
+            tree.write(f, encoding="utf-8", xml_declaration=True)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class JsonBlockJournal(EditJournal):
+    """result.json中block列表的编辑日志"""
+
+    def load_data(self):
+        """叠加日志后的完整JSON内容"""
+        with self.lock:
+            data = self._read_base()
+            self.replay(data["block"], self.read()[0])
+            return data
+
+    def _read_base(self):
+        with open(self.base_path) as f:
+            data = json.load(f)
+        data.setdefault("block", [])
+        return data
+
+    def _load(self):
+        return self._read_base()["block"]
+
+    def _write(self, path, entries):
+        data = self._read_base()
+        self.replay(data["block"], entries)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
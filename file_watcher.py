@@ -0,0 +1,127 @@
+# file_watcher.py
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gui_common import after_future
+
+POLL_INTERVAL = 0.25  # 检查文件状态的间隔（秒）
+SETTLE_TIME = 0.5     # 文件状态保持不变多久后认为已写完（秒）
+DELIVER_MS = 100      # GUI线程取出变化事件的间隔（毫秒）
+
+logger = logging.getLogger(__name__)
+
+
+class FileWatcher:
+    """后台轮询文件变化并刷新界面
+
+    监视线程只调用os.stat比较修改时间与大小，不读取文件内容。
+    状态变化后等待SETTLE_TIME不再变化（防抖，求解器已写完）才认为文件更新，
+    然后在工作线程中调用load(path)解析，结果在GUI线程中交给on_loaded。
+    解析失败（例如文件仍不完整）时只记录日志，文件再次变化时重新解析。
+    同一文件上使用相同load的多个监视只解析一次，结果分发给各自的on_loaded。
+    """
+
+    def __init__(self, interval=POLL_INTERVAL, settle=SETTLE_TIME):
+        self.interval = interval
+        self.settle = settle
+        self.watches = {}  # 路径 -> [(load, on_loaded, widget)]
+        self.states = {}   # 路径 -> [最近一次的状态, 状态变化时刻, 已处理的状态]
+        self.lock = threading.Lock()
+        self.events = queue.Queue()  # (widget, future, on_loaded)，由GUI线程取出
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-watch")
+        self._thread = None
+        self._stop = threading.Event()
+        self._root = None
+
+    def watch(self, path, load, on_loaded, widget):
+        """监视path（在GUI线程中调用），返回用于unwatch的句柄"""
+        entry = (load, on_loaded, widget)
+        with self.lock:
+            if path not in self.watches:
+                signature = _signature(path)
+                self.states[path] = [signature, None, signature]
+            self.watches.setdefault(path, []).append(entry)
+        if self._root is None:
+            self._root = widget.winfo_toplevel()
+            self._root.after(DELIVER_MS, self._deliver)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+            self._thread.start()
+        return path, entry
+
+    def unwatch(self, handle):
+        path, entry = handle
+        with self.lock:
+            entries = self.watches.get(path, [])
+            if entry in entries:
+                entries.remove(entry)
+
+    def stop(self):
+        self._stop.set()
+        self.executor.shutdown(wait=False)
+
+    def check(self):
+        """检查一轮所有被监视的文件（在监视线程中执行）"""
+        now = time.monotonic()
+        with self.lock:
+            for path, entries in self.watches.items():
+                state = self.states[path]
+                signature = _signature(path)
+                if signature != state[0]:
+                    state[0], state[1] = signature, now
+                    continue
+                if signature is None or signature == state[2] or now - state[1] < self.settle:
+                    continue
+                state[2] = signature
+                futures = {}
+                for load, on_loaded, widget in entries:
+                    if load not in futures:
+                        futures[load] = self.executor.submit(load, path)
+                    self.events.put((widget, futures[load], on_loaded))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("文件监视出错")
+
+    def _deliver(self):
+        """在GUI线程中取出变化事件，解析完成后调用on_loaded"""
+        while True:
+            try:
+                widget, future, on_loaded = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if widget.winfo_exists():
+                after_future(widget, future, on_loaded, _log_load_error)
+        self._root.after(DELIVER_MS, self._deliver)
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _log_load_error(error):
+    logger.warning("解析已更新的文件失败: %s", error)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared():
+    """进程内共用的文件监视器"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = FileWatcher()
+        return _shared
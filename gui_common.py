@@ -0,0 +1,119 @@
+# gui_common.py
+import time
+import tkinter as tk
+from contextlib import contextmanager
+from tkinter import ttk, messagebox
+
+from solver_runner import INFEASIBLE
+
+FUTURE_POLL_MS = 30  # 轮询后台任务结果的间隔（毫秒）
+
+
+def after_future(widget, future, on_done, on_error=None, interval=FUTURE_POLL_MS):
+    """在GUI线程中轮询后台任务，完成后调用on_done(结果)或on_error(异常)"""
+    if not future.done():
+        widget.after(interval, after_future, widget, future, on_done, on_error, interval)
+        return
+    try:
+        result = future.result()
+    except Exception as e:
+        if on_error is not None:
+            on_error(e)
+        else:
+            messagebox.showerror("错误", f"后台任务失败:\n{str(e)}")
+        return
+    on_done(result)
+
+
+class SolverStatusBar(ttk.Frame):
+    """求解器运行状态栏：定时取出SolverRunner队列中的事件并显示最新进度"""
+    POLL_MS = 200
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.runner = None
+        self.listeners = []  # 事件回调，参数为SolverRunner产生的事件元组
+        self._job = None
+        self.status_var = tk.StringVar(value="未运行")
+        ttk.Label(self, textvariable=self.status_var, anchor="w").pack(fill="x")
+
+    def attach(self, runner):
+        """开始跟踪新的运行器"""
+        if self._job is not None:
+            self.after_cancel(self._job)
+        self.runner = runner
+        self.status_var.set("运行中...")
+        self._job = self.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        self._job = None
+        for event in self.runner.drain():
+            for listener in self.listeners:
+                listener(event)
+            if event[0] == "progress":
+                self._show_progress(event[1])
+            elif event[0] == "exit":
+                best = self.runner.best_objective()
+                self.status_var.set(f"程序已结束（返回码 {event[1]}）" + (f"，最优值 {best}" if best is not None else ""))
+                return
+        self._job = self.after(self.POLL_MS, self._poll)
+
+    def _show_progress(self, point):
+        parts = []
+        if point.round is not None:
+            parts.append(f"第{point.round}轮")
+        if point.move is not None:
+            parts.append(f"第{point.move}次变动")
+        if point.time is not None:
+            parts.append(f"{point.time:g}秒")
+        parts.append("当前值 " + ("不可行" if point.objective >= INFEASIBLE else str(point.objective)))
+        if point.gap is not None:
+            parts.append(f"Gap {point.gap:.2e}")
+        best = self.runner.best_objective()
+        if best is not None:
+            parts.append(f"最优 {best}")
+        self.status_var.set("  ".join(parts))
+
+
+class StartupProfile:
+    """启动耗时记录
+
+    mark记录时间点，measure记录一段操作的耗时，
+    记录到"窗口可交互"时输出各阶段相对启动时刻的时间与耗时。
+    导入耗时的细节可配合python -X importtime查看。
+    """
+
+    def __init__(self, started=None, enabled=False):
+        self.started = started or time.perf_counter()
+        self.enabled = enabled
+        self.last = self.started
+        self.reported = False  # 已输出启动报告，之后的记录单独输出
+        self.records = []  # (名称, 开始时刻, 结束时刻)
+
+    def mark(self, name):
+        """记录自上一个时间点以来的阶段"""
+        now = time.perf_counter()
+        self.records.append((name, self.last, now))
+        self.last = now
+        if name == "窗口可交互" and not self.reported:
+            self.reported = True
+            if self.enabled:
+                print(self.report())
+
+    @contextmanager
+    def measure(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append((name, started, time.perf_counter()))
+            if self.enabled and self.reported:
+                print(self.format_record(self.records[-1]))
+
+    def format_record(self, record):
+        name, started, ended = record
+        return f"{name:<12}{(ended - started) * 1000:9.1f}ms  （于{(ended - self.started) * 1000:.1f}ms完成）"
+
+    def report(self):
+        lines = ["启动耗时："] + [self.format_record(record) for record in self.records]
+        return "\n".join(lines)
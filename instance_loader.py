@@ -0,0 +1,185 @@
+# instance_loader.py
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+CACHE_VERSION = 1  # 编译格式变化时递增，旧缓存自动失效
+
+# 编译结果中保存的数组
+ARRAY_FIELDS = (
+    "machine_stage", "charge_ids", "charge_cast", "charge_cc", "charge_seq",
+    "route", "process_time", "transport", "eat",
+)
+
+
+class SccInstance:
+    """SCC算例的稠密整数表
+
+    machine_stage  设备→阶段，设备号直接作为下标
+    charge_ids     升序炉次号，下标即炉次编码0..n-1
+    charge_cast / charge_cc / charge_seq  炉次所属浇次、指定连铸机、在浇次计划中的顺序
+    route          炉次×阶段的工艺路线（布尔）
+    process_time   炉次×阶段×(最短, 标准, 最长)加工时间（分钟），缺失为-1
+    transport      设备×设备运输时间（分钟）
+    eat            各设备最早可用时间相对eat_origin的偏移（分钟）
+    """
+
+    def __init__(self, arrays, eat_origin=""):
+        for name in ARRAY_FIELDS:
+            setattr(self, name, arrays[name])
+        self.eat_origin = eat_origin  # 最早的设备可用时刻，即排程结果的时间零点
+        self.n_stage = self.route.shape[1]
+
+    @classmethod
+    def from_data(cls, data):
+        """从instanceN.json的内容编译"""
+        machine_ids = np.array([int(m["machineid"]) for m in data["Machine"]])
+        machine_stage = np.full(machine_ids.max() + 1, -1, dtype=np.int32)
+        machine_stage[machine_ids] = [int(m["stageid"]) for m in data["Machine"]]
+        n_machine = len(machine_stage)
+        n_stage = int(machine_stage.max()) + 1
+
+        plan = data["Cast_plan"]
+        charge_ids = np.array(sorted(int(r["chargeid"]) for r in plan), dtype=np.int32)
+        code_of = {charge: code for code, charge in enumerate(charge_ids.tolist())}
+        n_charge = len(charge_ids)
+        arrays = {
+            "machine_stage": machine_stage,
+            "charge_ids": charge_ids,
+            "charge_cast": np.zeros(n_charge, dtype=np.int32),
+            "charge_cc": np.zeros(n_charge, dtype=np.int32),
+            "charge_seq": np.zeros(n_charge, dtype=np.int32),
+            "route": np.zeros((n_charge, n_stage), dtype=bool),
+            "process_time": np.full((n_charge, n_stage, 3), -1, dtype=np.int32),
+            "transport": np.zeros((n_machine, n_machine), dtype=np.int32),
+            "eat": np.zeros(n_machine, dtype=np.int32),
+        }
+        for seq, record in enumerate(plan):
+            code = code_of[int(record["chargeid"])]
+            arrays["charge_cast"][code] = int(record["castid"])
+            arrays["charge_cc"][code] = int(record["cc"])
+            arrays["charge_seq"][code] = seq
+            arrays["route"][code, [int(s) for s in record["chargeroute"].split("-")]] = True
+
+        for record in data["nonCC_Processing_Time"]:
+            code = code_of.get(int(record["chargeid"]))
+            if code is not None:
+                arrays["process_time"][code, int(record["stageid"])] = _time_bounds(record)
+        for record in data["CC_Processing_Time"]:
+            code = code_of.get(int(record["chargeid"]))
+            # 只保留浇次计划指定连铸机上的加工时间
+            if code is not None and int(record["ccid"]) == arrays["charge_cc"][code]:
+                arrays["process_time"][code, machine_stage[int(record["ccid"])]] = _time_bounds(record)
+
+        for record in data["Transport_Time"]:
+            source, target = (int(m) for m in record["transport_line"].split("-"))
+            arrays["transport"][source, target] = int(record["transport_time"])
+
+        eat_origin = ""
+        records = data.get("Earliest_available_time", [])
+        if records:
+            times = [datetime.fromisoformat(r["eat"]) for r in records]
+            origin = min(times)
+            for record, moment in zip(records, times):
+                arrays["eat"][int(record["machineid"])] = int((moment - origin).total_seconds() // 60)
+            eat_origin = origin.isoformat()
+        return cls(arrays, eat_origin)
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path) as f:
+            return cls.from_data(json.load(f))
+
+    def charge_code(self, charge):
+        """炉次号对应的编码，不在算例中时返回-1（可传入数组）"""
+        charge = np.asarray(charge)
+        code = np.searchsorted(self.charge_ids, charge)
+        code = np.minimum(code, len(self.charge_ids) - 1)
+        return np.where(self.charge_ids[code] == charge, code, -1)
+
+
+def _time_bounds(record):
+    return int(record["mintime"]), int(record["standard_time"]), int(record["maxtime"])
+
+
+def cache_path(path):
+    """编译缓存文件路径：instanceN.json -> instanceN.npz"""
+    return os.path.splitext(path)[0] + ".npz"
+
+
+def load_instance(path, use_cache=True):
+    """加载算例，优先使用同目录下的.npz编译缓存
+
+    缓存记录源文件的修改时间、大小与SHA1：修改时间与大小一致时直接使用；
+    不一致但内容摘要相同（如文件被复制或touch）时刷新缓存中的修改时间；
+    否则重新解析JSON并覆盖缓存。缓存无法写入时只返回解析结果。
+    """
+    if not use_cache:
+        return SccInstance.from_json(path)
+
+    stat = os.stat(path)
+    sidecar = cache_path(path)
+    digest = None
+    cached = _read_cache(sidecar)
+    if cached is not None:
+        arrays, meta = cached
+        if meta["mtime_ns"] == stat.st_mtime_ns and meta["size"] == stat.st_size:
+            return SccInstance(arrays, meta["eat_origin"])
+        digest = _file_sha1(path)
+        if meta["sha1"] == digest:
+            instance = SccInstance(arrays, meta["eat_origin"])
+            _write_cache(sidecar, instance, stat, digest)
+            return instance
+
+    instance = SccInstance.from_json(path)
+    _write_cache(sidecar, instance, stat, digest or _file_sha1(path))
+    return instance
+
+
+def _file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_cache(sidecar):
+    """读取缓存，格式版本不符或文件损坏时返回None"""
+    try:
+        with np.load(sidecar) as npz:
+            if int(npz["version"]) != CACHE_VERSION:
+                return None
+            arrays = {name: npz[name] for name in ARRAY_FIELDS}
+            meta = {
+                "mtime_ns": int(npz["mtime_ns"]),
+                "size": int(npz["size"]),
+                "sha1": str(npz["sha1"]),
+                "eat_origin": str(npz["eat_origin"]),
+            }
+        return arrays, meta
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _write_cache(sidecar, instance, stat, digest):
+    """写入未压缩的.npz缓存，先写临时文件再原子替换"""
+    temp = sidecar + ".tmp"
+    try:
+        with open(temp, "wb") as f:
+            np.savez(
+                f,
+                version=CACHE_VERSION,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                sha1=digest,
+                eat_origin=instance.eat_origin,
+                **{name: getattr(instance, name) for name in ARRAY_FIELDS}
+            )
+        os.replace(temp, sidecar)
+    except OSError:
+        if os.path.exists(temp):
+            os.remove(temp)
@@ -0,0 +1,143 @@
+# schedule_compare.py
+import numpy as np
+
+# 完工时间相差超过该倍数时认为两个结果的时间单位不一致
+MAKESPAN_RATIO_LIMIT = 10
+
+
+class ScheduleComparison:
+    """多个排程结果的对齐与差异，第一个结果为基准
+
+    任务块按(浇次, 炉次, 工序序号)对齐，工序序号为任务块在所属炉次中
+    按开始时间排序的位置。设备不参与对齐，同一工序换到其他设备时记为设备变更。
+    对齐后各列为(结果数, 键数)数组，缺失的任务块时间为NaN、设备为-1。
+    时间取ScheduleModel.starts/ends，毫秒结果已统一换算为相对时间（秒）。
+    """
+
+    def __init__(self, models, names=None):
+        self.models = list(models)
+        self.names = list(names) if names is not None else [f"方案{i + 1}" for i in range(len(self.models))]
+        keys = [_block_keys(model) for model in self.models]
+        self.keys = np.unique(np.concatenate(keys), axis=0) if keys else np.empty((0, 3), dtype=np.int64)
+
+        shape = (len(self.models), len(self.keys))
+        self.present = np.zeros(shape, dtype=bool)
+        self.start = np.full(shape, np.nan)
+        self.end = np.full(shape, np.nan)
+        self.machine = np.full(shape, -1, dtype=np.int64)
+        self.block = np.full(shape, -1, dtype=np.intp)  # 对应各结果中的任务块下标
+        for i, (model, model_keys) in enumerate(zip(self.models, keys)):
+            position = _find_rows(self.keys, model_keys)
+            self.present[i, position] = True
+            self.start[i, position] = model.starts
+            self.end[i, position] = model.ends
+            self.machine[i, position] = model.blocks["machine"]
+            self.block[i, position] = np.arange(len(model))
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def start_delta(self):
+        """各任务块开始时间相对基准的变化（任一方缺失时为NaN）"""
+        return self.start - self.start[0]
+
+    @property
+    def end_delta(self):
+        return self.end - self.end[0]
+
+    @property
+    def moved(self):
+        """两方都有且设备不同的任务块"""
+        return self.present & self.present[0] & (self.machine != self.machine[0])
+
+    @property
+    def changed(self):
+        """设备或时间与基准不同的任务块"""
+        shifted = (self.start_delta != 0) | (self.end_delta != 0)
+        return self.moved | (self.present & self.present[0] & shifted)
+
+    def makespan(self):
+        return np.array([model.ends.max() if len(model) else 0.0 for model in self.models])
+
+    def idle_time(self):
+        """各结果所有设备上相邻任务块之间的空闲时间总和"""
+        idle = []
+        for model in self.models:
+            _, gaps = model.merged_intervals()
+            idle.append((gaps[2] - gaps[1]).sum())
+        return np.array(idle)
+
+    def summary(self):
+        """每个结果一行：完工时间、空闲时间及其相对基准的变化、设备变更与时间变化统计"""
+        makespan = self.makespan()
+        idle = self.idle_time()
+        both = self.present & self.present[0]
+        delta = np.abs(np.where(both, self.start_delta, 0))
+        rows = []
+        for i, name in enumerate(self.names):
+            rows.append({
+                "name": name,
+                "blocks": int(self.present[i].sum()),
+                "makespan": float(makespan[i]),
+                "makespan_delta": float(makespan[i] - makespan[0]),
+                "idle": float(idle[i]),
+                "idle_delta": float(idle[i] - idle[0]),
+                "moved": int(self.moved[i].sum()),
+                "shifted": int((delta[i] > 0).sum()),
+                "mean_shift": float(delta[i][both[i]].mean()) if both[i].any() else 0.0,
+                "max_shift": float(delta[i].max()) if len(delta[i]) else 0.0,
+                "missing": int((self.present[0] & ~self.present[i]).sum()),
+                "extra": int((self.present[i] & ~self.present[0]).sum()),
+            })
+        return rows
+
+
+def incompatibility(base, other):
+    """other与base不是同一算例的排程结果时返回原因，可以对比时返回None
+
+    结果文件都带有设备列表时比较设备名称，否则比较使用到的设备；
+    两者的(浇次, 炉次)集合必须相同；换算为秒后完工时间相差不超过
+    MAKESPAN_RATIO_LIMIT倍，否则是未能识别的时间单位，差值没有意义。
+    """
+    if base.machine_info and other.machine_info:
+        if [m.get("name") for m in base.machine_info] != [m.get("name") for m in other.machine_info]:
+            return "设备列表不同"
+    elif not np.array_equal(base.machines, other.machines):
+        return "使用的设备不同"
+    if not np.array_equal(_charge_keys(base), _charge_keys(other)):
+        return "浇次与炉次不同"
+    if len(base) and len(other) and base.ends.max() > 0 and other.ends.max() > 0:
+        ratio = base.ends.max() / other.ends.max()
+        if not 1 / MAKESPAN_RATIO_LIMIT <= ratio <= MAKESPAN_RATIO_LIMIT:
+            return "时间单位不一致"
+    return None
+
+
+def _charge_keys(model):
+    blocks = model.blocks
+    return np.unique(np.column_stack((blocks["cast"], blocks["charge"])), axis=0)
+
+
+def _block_keys(model):
+    """各任务块的(浇次, 炉次, 工序序号)，形状为(n, 3)"""
+    blocks = model.blocks
+    n = len(blocks)
+    order = np.lexsort((model.starts, blocks["charge"], blocks["cast"]))
+    cast, charge = blocks["cast"][order], blocks["charge"][order]
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = (cast[1:] != cast[:-1]) | (charge[1:] != charge[:-1])
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(n), 0))
+    ordinal = np.empty(n, dtype=np.int64)
+    ordinal[order] = np.arange(n) - group_start
+    return np.column_stack((blocks["cast"], blocks["charge"], ordinal)).astype(np.int64)
+
+
+def _find_rows(table, rows):
+    """rows中每一行在按行排序的唯一表table中的位置"""
+    view = np.dtype((np.void, table.dtype.itemsize * table.shape[1]))
+    table_view = np.ascontiguousarray(table).view(view).ravel()
+    rows_view = np.ascontiguousarray(rows).view(view).ravel()
+    # np.unique(axis=0)按字典序排序，void视图按字节比较，两者顺序不一致，需要单独排序
+    order = np.argsort(table_view)
+    return order[np.searchsorted(table_view[order], rows_view)]
@@ -0,0 +1,145 @@
+# schedule_evaluator.py
+import numpy as np
+
+TIME_UNIT = 60  # 算例中的时间以分钟计，排程结果以秒计
+
+# 目标分量的默认权重：阶段间等待时间与加工时间偏差（秒）
+DEFAULT_WEIGHTS = {"wait": 1.0, "deviation": 1.0}
+
+# 约束违反项：
+#   route      工艺路线不符（缺少/多出/重复的阶段，或炉次不在算例中）
+#   caster     连铸阶段未使用浇次计划指定的连铸机
+#   transport  相邻阶段间隔小于运输时间（秒）
+#   min_time   加工时间短于最短加工时间（秒）
+#   max_time   加工时间超过最长加工时间（秒）
+#   overlap    同一设备上任务块重叠（秒）
+#   cast_break 同一浇次相邻炉次在连铸机上断浇的次数
+# 早于设备最早可用时间开工的时长（eat，秒）只作为目标分量报告，不计入可行性：
+# SCC_SOLU中的参考解都让第一阶段设备在开始后几分钟内依次开工，并不遵守该时间
+VIOLATIONS = ("route", "caster", "transport", "min_time", "max_time", "overlap", "cast_break")
+
+
+class ScheduleEvaluator:
+    """向量化的排程评价与可行性检查
+
+    任务块的炉次与设备分配固定，构造时一次性建立查表结果与比较对
+    （同一炉次的相邻阶段、同一浇次的相邻炉次），之后评价只涉及开始/结束时间。
+    starts/ends可以是长度n的一维数组（单个方案），也可以是(k, n)数组
+    （k个候选方案），所有分量按方案给出。
+    unbounded为不检查加工时间上下限的任务块下标。
+    """
+
+    def __init__(self, instance, charges, machines, weights=None, unbounded=None):
+        self.instance = instance
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        machines = np.asarray(machines, dtype=np.intp)
+        codes = instance.charge_code(charges)
+        known = codes >= 0
+        stage = instance.machine_stage[machines]
+        self.machines = machines
+
+        # 加工时间上下限（秒），不在算例中的任务块不参与检查
+        bounds = np.where(known[:, None], instance.process_time[np.maximum(codes, 0), stage], -1)
+        self.has_bounds = bounds[:, 0] >= 0
+        if unbounded is not None:
+            self.has_bounds[unbounded] = False
+        self.min_time, self.std_time, self.max_time = (bounds * TIME_UNIT).T
+        self.eat = instance.eat[machines] * TIME_UNIT
+
+        # 工艺路线：各炉次经过的阶段次数与路线逐项比较
+        visits = np.zeros(instance.route.shape, dtype=np.int32)
+        np.add.at(visits, (codes[known], stage[known]), 1)
+        self.route_violations = int(np.abs(visits - instance.route).sum() + (~known).sum())
+
+        cc_stage = instance.machine_stage[instance.charge_cc[np.maximum(codes, 0)]]
+        on_caster = known & (stage == cc_stage)
+        self.caster_violations = int((machines[on_caster] != instance.charge_cc[codes[on_caster]]).sum())
+
+        # 同一炉次按阶段排序后的相邻任务块
+        order = np.lexsort((stage, codes))
+        same_charge = (codes[order][1:] == codes[order][:-1]) & known[order][1:]
+        self.route_prev = order[:-1][same_charge]
+        self.route_next = order[1:][same_charge]
+        self.transport = instance.transport[machines[self.route_prev], machines[self.route_next]] * TIME_UNIT
+
+        # 连铸机上同一浇次按计划顺序相邻的炉次
+        caster = np.flatnonzero(on_caster)
+        caster = caster[np.lexsort((instance.charge_seq[codes[caster]], instance.charge_cast[codes[caster]]))]
+        casts = instance.charge_cast[codes[caster]]
+        same_cast = casts[1:] == casts[:-1]
+        self.cast_prev = caster[:-1][same_cast]
+        self.cast_next = caster[1:][same_cast]
+
+    def evaluate(self, starts, ends):
+        """计算目标分量与约束违反量，返回{名称: 数值或长度k的数组}"""
+        starts = np.asarray(starts, dtype=float)
+        ends = np.asarray(ends, dtype=float)
+        single = starts.ndim == 1
+        starts, ends = np.atleast_2d(starts), np.atleast_2d(ends)
+        k = len(starts)
+
+        duration = ends - starts
+        bounded = self.has_bounds
+        deviation = np.abs(duration - self.std_time)[:, bounded].sum(axis=1)
+        min_time = np.maximum(self.min_time - duration, 0)[:, bounded].sum(axis=1)
+        max_time = np.maximum(duration - self.max_time, 0)[:, bounded].sum(axis=1)
+
+        slack = starts[:, self.route_next] - ends[:, self.route_prev] - self.transport
+        wait = np.maximum(slack, 0).sum(axis=1)
+        transport = np.maximum(-slack, 0).sum(axis=1)
+
+        eat = np.maximum(self.eat - starts, 0).sum(axis=1)
+
+        cast_gap = starts[:, self.cast_next] - ends[:, self.cast_prev]
+        cast_break = (cast_gap > 0).sum(axis=1)
+
+        result = {
+            "makespan": ends.max(axis=1) if ends.shape[1] else np.zeros(k),
+            "wait": wait,
+            "deviation": deviation,
+            "route": np.full(k, self.route_violations),
+            "caster": np.full(k, self.caster_violations),
+            "transport": transport,
+            "min_time": min_time,
+            "max_time": max_time,
+            "eat": eat,
+            "overlap": self._machine_overlap(starts, ends).sum(axis=1),
+            "cast_break": cast_break,
+        }
+        result["objective"] = sum(self.weights[name] * result[name] for name in self.weights)
+        result["feasible"] = ~np.any([result[name] > 0 for name in VIOLATIONS], axis=0)
+        if single:
+            return {name: value[0].item() for name, value in result.items()}
+        return result
+
+    def block_violations(self, starts, ends):
+        """单个方案中违反约束的任务块（布尔数组），用于界面标记"""
+        starts = np.asarray(starts, dtype=float)
+        ends = np.asarray(ends, dtype=float)
+        duration = ends - starts
+        bad = self.has_bounds & ((duration < self.min_time) | (duration > self.max_time))
+
+        late = starts[self.route_next] - ends[self.route_prev] < self.transport
+        bad[self.route_prev[late]] = bad[self.route_next[late]] = True
+        broken = starts[self.cast_next] - ends[self.cast_prev] > 0  # 与evaluate中断浇的定义一致
+        bad[self.cast_prev[broken]] = bad[self.cast_next[broken]] = True
+
+        order, overlap = self._machine_order(starts[None], ends[None])
+        clash = overlap[0] > 0
+        bad[order[0, :-1][clash]] = bad[order[0, 1:][clash]] = True
+        return bad
+
+    def _machine_order(self, starts, ends):
+        """各方案按(设备, 开始时间)排序的下标与相邻任务块的重叠量"""
+        if starts.shape[1] < 2:
+            return np.zeros(starts.shape, dtype=np.intp), np.zeros((len(starts), 0))
+        span = ends.max() - starts.min() + 1
+        order = np.argsort(self.machines * span + (starts - starts.min()), axis=1, kind="stable")
+        sorted_starts = np.take_along_axis(starts, order, axis=1)
+        sorted_ends = np.take_along_axis(ends, order, axis=1)
+        same_machine = self.machines[order][:, 1:] == self.machines[order][:, :-1]
+        overlap = np.where(same_machine, np.maximum(sorted_ends[:, :-1] - sorted_starts[:, 1:], 0), 0)
+        return order, overlap
+
+    def _machine_overlap(self, starts, ends):
+        return self._machine_order(starts, ends)[1]
@@ -0,0 +1,93 @@
+# schedule_kpi.py
+import numpy as np
+
+from schedule_evaluator import TIME_UNIT
+
+
+class ScheduleKpi:
+    """排程结果的统计指标，构造时一次性向量化计算
+
+    设备：任务块按(设备, 开始时间)排序后对相邻任务块做差，得到各设备的
+    加工时间、空闲时间、最大空闲间隔与利用率（加工时间/排程总跨度）。
+    阶段间等待：同一炉次按开始时间相邻的任务块之间的间隔，提供算例时扣除运输时间。
+    连铸：各炉次的最后一个任务块视为连铸工序，同一浇次相邻炉次之间有间隔即为断浇；
+    提供算例时给出各浇次开浇时间相对连铸机最早可用时间的偏差（否则为NaN）。
+    时间均为相对时间（秒），与ScheduleModel.starts/ends一致。
+    """
+
+    def __init__(self, model, instance=None):
+        self.instance = instance
+        blocks = model.blocks
+        starts, ends = model.starts, model.ends
+        n = len(blocks)
+        self.makespan = float(ends.max()) if n else 0.0
+        self.horizon = float(ends.max() - starts.min()) if n else 0.0
+
+        # ---------- 设备 ----------
+        machine = blocks["machine"]
+        order = np.lexsort((starts, machine))
+        machine, s, e = machine[order], starts[order], ends[order]
+        self.machines = model.machines
+        first = np.searchsorted(machine, self.machines)
+        if n:
+            gap = np.zeros(n)  # 与同一设备上前一任务块的间隔，负数为重叠
+            gap[1:] = np.where(machine[1:] == machine[:-1], s[1:] - e[:-1], 0)
+            idle = np.maximum(gap, 0)
+            self.machine_blocks = np.diff(np.append(first, n))
+            self.machine_busy = np.add.reduceat(e - s, first)
+            self.machine_idle = np.add.reduceat(idle, first)
+            self.machine_max_idle = np.maximum.reduceat(idle, first)
+            self.machine_overlap = np.add.reduceat(np.maximum(-gap, 0), first)
+        else:
+            self.machine_blocks = np.empty(0, dtype=np.intp)
+            self.machine_busy = self.machine_idle = self.machine_max_idle = self.machine_overlap = np.empty(0)
+        self.utilization = self.machine_busy / self.horizon if self.horizon > 0 else np.zeros(len(first))
+
+        # ---------- 阶段间等待 ----------
+        charge = blocks["charge"]
+        order = np.lexsort((starts, charge))
+        same_charge = charge[order][1:] == charge[order][:-1]
+        prev, next_ = order[:-1][same_charge], order[1:][same_charge]
+        wait = starts[next_] - ends[prev]
+        if instance is not None:
+            wait = wait - instance.transport[blocks["machine"][prev], blocks["machine"][next_]] * TIME_UNIT
+        self.stage_wait = np.maximum(wait, 0)
+
+        # ---------- 连铸 ----------
+        # 各炉次开始最晚的任务块即连铸工序
+        last = order[np.append(~same_charge, True)] if n else np.empty(0, dtype=np.intp)
+        cast = blocks["cast"][last]
+        caster = last[np.lexsort((starts[last], cast))]
+        cast = blocks["cast"][caster]
+        self.casts, cast_first = np.unique(cast, return_index=True)
+        break_gap = np.zeros(len(caster))
+        if len(caster):
+            break_gap[1:] = np.where(cast[1:] == cast[:-1], starts[caster[1:]] - ends[caster[:-1]], 0)
+            self.cast_breaks = np.add.reduceat((break_gap > 0).astype(np.intp), cast_first)
+            self.cast_break_time = np.add.reduceat(np.maximum(break_gap, 0), cast_first)
+        else:
+            self.cast_breaks = np.empty(0, dtype=np.intp)
+            self.cast_break_time = np.empty(0)
+        self.cast_charges = np.diff(np.append(cast_first, len(caster))) if len(caster) else np.empty(0, dtype=np.intp)
+        self.cast_machine = blocks["machine"][caster[cast_first]]
+        self.cast_start = starts[caster[cast_first]]
+        self.cast_eat = np.full(len(self.casts), np.nan)
+        if instance is not None:
+            self.cast_eat[:] = instance.eat[self.cast_machine] * TIME_UNIT
+        self.cast_deviation = self.cast_start - self.cast_eat
+
+    def summary(self):
+        """总体指标，{名称: 数值}"""
+        deviation = self.cast_deviation[~np.isnan(self.cast_deviation)]
+        return {
+            "makespan": self.makespan,
+            "horizon": self.horizon,
+            "utilization": float(self.utilization.mean()) if len(self.utilization) else 0.0,
+            "idle": float(self.machine_idle.sum()),
+            "wait": float(self.stage_wait.sum()),
+            "mean_wait": float(self.stage_wait.mean()) if len(self.stage_wait) else 0.0,
+            "max_wait": float(self.stage_wait.max()) if len(self.stage_wait) else 0.0,
+            "cast_breaks": int(self.cast_breaks.sum()),
+            "cast_break_time": float(self.cast_break_time.sum()),
+            "max_deviation": float(deviation.max()) if len(deviation) else float("nan"),
+        }
@@ -0,0 +1,200 @@
+# schedule_model.py
+import json
+
+import numpy as np
+
+from schedule_kpi import ScheduleKpi
+
+# 任务块结构化数组的字段定义
+BLOCK_DTYPE = np.dtype([
+    ("cast", "i4"),
+    ("charge", "i4"),
+    ("machine", "i4"),
+    ("start", "i8"),
+    ("end", "i8"),
+    ("type", "U8"),
+    ("highlight", "?"),
+])
+
+# 结果文件中的时间以秒计，但部分参考解（SCC_SOLU）以毫秒计；
+# 任务块时长的中位数超过一天时按毫秒换算为秒
+MILLISECOND_THRESHOLD = 24 * 3600
+
+
+class ScheduleModel:
+    """炼钢连铸排程结果的列式数据模型
+
+    任务块保存在NumPy结构化数组中（cast/charge/machine/start/end/type/highlight），
+    并预先计算按设备、按炉次分组且按开始时间排序的下标，
+    按设备、炉次或时间窗口筛选都是数组切片，不再逐条遍历字典。
+    结构化数组保留文件中的原始时间，starts/ends统一为相对时间（秒）。
+    """
+
+    def __init__(self, blocks, start_time=0, machine_info=None):
+        self.blocks = blocks
+        self.start_time = start_time
+        self.machine_info = machine_info or []  # 结果文件中的设备描述列表
+        self.violations = np.zeros(len(blocks), dtype=bool)  # 校验出的违反约束任务块，与手动高亮分开保存
+        self._build_index()
+
+    @classmethod
+    def from_json(cls, path):
+        """从result.json/sol格式的结果文件加载"""
+        with open(path) as f:
+            data = json.load(f)
+        return cls.from_blocks(data.get("block", []), data.get("start_time", 0), data.get("machine"))
+
+    @classmethod
+    def from_blocks(cls, block_list, start_time=0, machine_info=None):
+        """从任务块字典列表构建"""
+        blocks = np.zeros(len(block_list), dtype=BLOCK_DTYPE)
+        for name in ("cast", "charge", "machine", "start", "end"):
+            blocks[name] = [int(item[name]) for item in block_list]
+        blocks["type"] = [item.get("type", "main") for item in block_list]
+        blocks["highlight"] = [bool(item.get("highlight", False)) for item in block_list]
+        return cls(blocks, start_time, machine_info)
+
+    def to_blocks(self):
+        """转换回结果文件中的任务块字典列表（不含高亮状态）"""
+        names = ("cast", "charge", "end", "machine", "start", "type")
+        columns = [self.blocks[name].tolist() for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def _build_index(self):
+        """建立设备、炉次分组下标与时间数组"""
+        blocks = self.blocks
+        self.machines = np.unique(blocks["machine"])
+        self.charges = np.unique(blocks["charge"])
+        # 甘特图行号（从1开始）与炉次编码
+        self.machine_row = np.searchsorted(self.machines, blocks["machine"]) + 1
+        self.charge_code = np.searchsorted(self.charges, blocks["charge"])
+
+        self.machine_index = _group_index(blocks["machine"], blocks["start"], self.machines)
+        self.charge_index = _group_index(blocks["charge"], blocks["start"], self.charges)
+
+        # 任务块时间若为绝对时间（不小于start_time），则换算为相对时间
+        offset = 0
+        if len(blocks) and self.start_time and blocks["start"].min() >= self.start_time:
+            offset = self.start_time
+        scale = 1
+        if len(blocks) and np.median(blocks["end"] - blocks["start"]) > MILLISECOND_THRESHOLD:
+            scale = 1000
+        self._set_time_base(offset, scale)
+
+    def _set_time_base(self, offset, scale):
+        """按时间零点与单位（每秒的文件时间单位数）计算相对时间"""
+        self.time_offset = offset
+        self.time_scale = scale
+        self.starts = (self.blocks["start"] - offset) / scale
+        self.ends = (self.blocks["end"] - offset) / scale
+        self._kpi = None
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def column(self, name):
+        return self.blocks[name]
+
+    @property
+    def highlight(self):
+        return self.blocks["highlight"]
+
+    def toggle_highlight(self, index):
+        self.blocks["highlight"][index] ^= True
+
+    def update_blocks(self, indices, starts, ends, machines=None):
+        """修改任务块的时间（相对时间，秒）与设备，并重建分组下标"""
+        indices = np.asarray(indices, dtype=np.intp)
+        offset, scale = self.time_offset, self.time_scale
+        self.blocks["start"][indices] = np.rint(np.asarray(starts) * scale).astype(np.int64) + offset
+        self.blocks["end"][indices] = np.rint(np.asarray(ends) * scale).astype(np.int64) + offset
+        if machines is not None:
+            self.blocks["machine"][indices] = machines
+        self.violations[:] = False  # 校验结果在修改后失效，需要重新校验
+        self._build_index()
+        if (self.time_offset, self.time_scale) != (offset, scale):
+            # 编辑后不再满足判断条件时保持原有的换算方式
+            self._set_time_base(offset, scale)
+
+    # ----------------- 筛选 -----------------
+    def by_machine(self, machine):
+        """指定设备上的任务块下标（按开始时间排序）"""
+        return self.machine_index.get(machine, _EMPTY)
+
+    def by_charge(self, charge):
+        """指定炉次的任务块下标（按开始时间排序）"""
+        return self.charge_index.get(charge, _EMPTY)
+
+    def in_window(self, t0, t1):
+        """与时间窗口[t0, t1]有交集的任务块下标"""
+        return np.flatnonzero((self.ends >= t0) & (self.starts <= t1))
+
+    def select(self, machine=None, charge=None, window=None):
+        """组合条件筛选，返回任务块下标"""
+        mask = np.ones(len(self.blocks), dtype=bool)
+        if machine is not None:
+            mask &= self.blocks["machine"] == machine
+        if charge is not None:
+            mask &= self.blocks["charge"] == charge
+        if window is not None:
+            mask &= (self.ends >= window[0]) & (self.starts <= window[1])
+        return np.flatnonzero(mask)
+
+    # ----------------- 统计 -----------------
+    def time_range(self):
+        """返回(最早开始时间, 最晚结束时间)"""
+        if not len(self.blocks):
+            return 0.0, 0.0
+        return self.starts.min(), self.ends.max()
+
+    def kpi(self, instance=None):
+        """排程统计指标（ScheduleKpi），按算例缓存，任务块修改后重新计算"""
+        if self._kpi is None or self._kpi.instance is not instance:
+            self._kpi = ScheduleKpi(self, instance)
+        return self._kpi
+
+    def merged_intervals(self, indices=None, min_gap=0):
+        """按设备合并任务块，返回(占用区间, 空闲区间)，行号为甘特图行号"""
+        if indices is None:
+            indices = slice(None)
+        return merge_machine_intervals(self.machine_row[indices].astype(float),
+                                       self.starts[indices], self.ends[indices], min_gap)
+
+
+_EMPTY = np.empty(0, dtype=np.intp)
+
+
+def _group_index(keys, starts, unique_keys):
+    """按键分组并在组内按开始时间排序，返回{键: 下标数组}"""
+    order = np.lexsort((starts, keys))
+    bounds = np.searchsorted(keys[order], unique_keys)
+    return dict(zip(unique_keys.tolist(), np.split(order, bounds[1:])))
+
+
+def merge_machine_intervals(rows, starts, ends, min_gap=0):
+    """按设备行合并任务块，返回(占用区间, 空闲区间)
+
+    两者均为(rows, starts, ends)数组元组。间隔不超过min_gap的相邻任务块
+    视为连续占用。先按(行, 开始时间)排序，再给每行加上足够大的偏移量，
+    使一次全局累计最大值即可得到各行内的当前占用结束时间。
+    """
+    empty = (np.empty(0), np.empty(0), np.empty(0))
+    if len(starts) == 0:
+        return empty, empty
+
+    order = np.lexsort((starts, rows))
+    rows, starts, ends = rows[order], starts[order], ends[order]
+    offset = (rows - rows.min()) * (ends.max() - starts.min() + min_gap + 1)
+    running_end = np.maximum.accumulate(ends + offset) - offset
+
+    # 与前面区间不相连或换行的位置开始新的占用区间
+    new_interval = np.ones(len(starts), dtype=bool)
+    new_interval[1:] = (starts[1:] > running_end[:-1] + min_gap) | (rows[1:] != rows[:-1])
+    first = np.flatnonzero(new_interval)
+    last = np.append(first[1:] - 1, len(starts) - 1)
+    busy = (rows[first], starts[first], running_end[last])
+
+    # 同一行相邻占用区间之间即为空闲区间
+    same_row = busy[0][1:] == busy[0][:-1]
+    idle = (busy[0][1:][same_row], busy[2][:-1][same_row], busy[1][1:][same_row])
+    return busy, idle
@@ -0,0 +1,131 @@
+# schedule_propagation.py
+import bisect
+import heapq
+
+import numpy as np
+
+from schedule_evaluator import TIME_UNIT
+
+
+class PrecedenceGraph:
+    """排程任务块的前后约束图与增量传播
+
+    后继关系分三类：
+      同一炉次的下一阶段（间隔不小于两台设备间的运输时间）
+      同一浇次在连铸机上的下一炉次（连浇，不早于前一炉次结束）
+      同一设备上的下一任务块（不重叠）
+    前两类在构造时由任务块列表一次建立，设备上的顺序随编辑维护。
+    移动一个任务块时只沿后继边把受影响的任务块向后顺延（加工时长不变），
+    不会把后继提前，也不触及其余任务块。
+    """
+
+    def __init__(self, model, instance=None, max_steps=None):
+        self.model = model
+        self.instance = instance  # 提供运输时间与设备阶段，可为None
+        self.max_steps = max_steps or 20 * max(len(model), 1)
+        blocks = model.blocks
+        starts = model.starts
+        self.successors = [[] for _ in range(len(model))]
+
+        # 同一炉次按开始时间排序即为工艺路线顺序
+        order = np.lexsort((starts, blocks["charge"]))
+        same_charge = blocks["charge"][order][1:] == blocks["charge"][order][:-1]
+        for u, v in zip(order[:-1][same_charge].tolist(), order[1:][same_charge].tolist()):
+            self.successors[u].append((v, True))
+
+        # 各炉次的最后一道工序在连铸机上，同一浇次按开始时间相邻
+        last = order[np.append(~same_charge, True)]
+        last = last[np.lexsort((starts[last], blocks["cast"][last]))]
+        same_cast = blocks["cast"][last][1:] == blocks["cast"][last][:-1]
+        for u, v in zip(last[:-1][same_cast].tolist(), last[1:][same_cast].tolist()):
+            self.successors[u].append((v, False))
+
+        # 各设备上按开始时间排序的任务块
+        self.machine_order = {m: idx.tolist() for m, idx in model.machine_index.items()}
+
+        if instance is not None:
+            self.machine_stage = dict(enumerate(instance.machine_stage.tolist()))
+        else:
+            self.machine_stage = {int(m["order"]): int(m["stage"]) for m in model.machine_info
+                                  if "order" in m and "stage" in m}
+
+    def can_move_to(self, index, machine):
+        """任务块只能移到同一阶段的设备上"""
+        current = int(self.model.blocks["machine"][index])
+        if machine == current:
+            return True
+        stage = self.machine_stage.get(current)
+        return stage is not None and self.machine_stage.get(machine) == stage
+
+    def propagate(self, index, new_start, machine=None):
+        """计算移动任务块后需要顺延的任务块，不修改数据模型
+
+        返回{下标: (开始时间, 结束时间)}，包含被移动的任务块本身。
+        """
+        model = self.model
+        machines = model.blocks["machine"]
+        source = int(machines[index])
+        machine = source if machine is None else int(machine)
+        new_start = float(round(new_start))
+        changes = {index: (new_start, new_start + model.ends[index] - model.starts[index])}
+
+        # 只有被移动任务块所在的一两台设备顺序发生变化
+        lanes = {}
+        lane = [i for i in self.machine_order.get(source, []) if i != index]
+        lanes[source] = lane
+        if machine != source:
+            lane = list(self.machine_order.get(machine, []))
+            lanes[machine] = lane
+        keys = [model.starts[i] for i in lane]
+        lane.insert(bisect.bisect_right(keys, new_start), index)
+
+        def machine_of(i):
+            return machine if i == index else int(machines[i])
+
+        def times(i):
+            return changes.get(i) or (model.starts[i], model.ends[i])
+
+        heap = [(new_start, index)]
+        steps = 0
+        while heap:
+            _, u = heapq.heappop(heap)
+            u_end = times(u)[1]
+            m_u = machine_of(u)
+            for v, lag in self._successors(u, m_u, lanes, machine_of):
+                need = u_end + lag
+                start, end = times(v)
+                if start >= need:
+                    continue
+                changes[v] = (need, need + end - start)
+                heapq.heappush(heap, (need, v))
+                steps += 1
+                if steps > self.max_steps:
+                    raise ValueError("约束图中存在环，无法完成顺延")
+        return changes
+
+    def commit(self, index, changes, machine=None):
+        """把propagate的结果写回数据模型并更新设备顺序"""
+        model = self.model
+        indices = np.fromiter(changes, dtype=np.intp, count=len(changes))
+        times = np.array([changes[i] for i in indices.tolist()], dtype=float)
+        machines = model.blocks["machine"][indices]
+        if machine is not None:
+            machines[indices == index] = machine
+        model.update_blocks(indices, times[:, 0], times[:, 1], machines)
+        self.machine_order = {m: idx.tolist() for m, idx in model.machine_index.items()}
+
+    def _successors(self, u, m_u, lanes, machine_of):
+        """u的后继及最小间隔（秒）"""
+        for v, is_route in self.successors[u]:
+            lag = 0
+            if is_route and self.instance is not None:
+                m_v = machine_of(v)
+                transport = self.instance.transport
+                if m_u < len(transport) and m_v < len(transport):
+                    lag = transport[m_u, m_v] * TIME_UNIT
+            yield v, lag
+
+        lane = lanes.get(m_u) or self.machine_order.get(m_u, [])
+        position = lane.index(u)
+        if position + 1 < len(lane):
+            yield lane[position + 1], 0
@@ -0,0 +1,240 @@
+# solver_runner.py
+import os
+import queue
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque, namedtuple
+
+LOG_ENCODING = "gbk"     # 求解器输出与日志文件的编码
+INFEASIBLE = 2147483647  # 求解器用INT_MAX表示不可行解
+LOG_POLL_INTERVAL = 0.5  # 日志文件轮询间隔（秒）
+
+# 求解进度点：kind为匹配到的日志格式，round/move/time/gap/previous缺失时为None
+ProgressPoint = namedtuple("ProgressPoint", "seq kind round move objective previous time gap")
+
+# 已知的求解器日志行格式
+PROGRESS_PATTERNS = [
+    ("local_search", re.compile(
+        r"第(?P<round>\d+)轮搜索,第(?P<move>\d+)次变动.*?当前优化值[：:](?P<objective>\d+)"
+        r"[，,]该轮搜索前值[：:](?P<previous>\d+)")),
+    ("cp", re.compile(
+        r"当前时间为[：:]?(?P<time>[\d.]+)\s*当前目标值为(?P<objective>\d+)\s*"
+        r"当前目标值的Gap为(?P<gap>[\d.eE+-]+)")),
+    ("improve", re.compile(r"找到更优解[：:](?P<objective>\d+)[，,]原值为(?P<previous>\d+)")),
+    ("partial", re.compile(r"原目标值为(?P<previous>\d+)当前求解结果为[：:](?P<objective>\d+)")),
+    ("time_limit", re.compile(r"求解时间[：:](?P<time>[\d.]+)[，,]结果值为(?P<objective>\d+)")),
+    ("final", re.compile(r"当前目标值为(?P<objective>\d+)[，,]轮次为(?P<round>\d+)")),
+    ("objective", re.compile(r"(?:CP求解为|当前值为[：:]?|初始解为|-{3,}[\w-]+-{3,})(?P<objective>\d+)")),
+]
+
+
+def parse_progress_line(line, seq=0):
+    """解析一行求解器输出，识别到目标值时返回ProgressPoint，否则返回None"""
+    for kind, pattern in PROGRESS_PATTERNS:
+        match = pattern.search(line)
+        if match:
+            fields = match.groupdict()
+            return ProgressPoint(
+                seq=seq,
+                kind=kind,
+                round=_to_number(fields.get("round"), int),
+                move=_to_number(fields.get("move"), int),
+                objective=int(fields["objective"]),
+                previous=_to_number(fields.get("previous"), int),
+                time=_to_number(fields.get("time"), float),
+                gap=_to_number(fields.get("gap"), float),
+            )
+    return None
+
+
+def read_progress_file(path, encoding=LOG_ENCODING):
+    """一次性解析整个日志文件，返回ProgressPoint列表"""
+    tail = LogTail(path, encoding)
+    lines = tail.read_lines() + tail.flush()
+    points = []
+    for line in lines:
+        point = parse_progress_line(line, len(points))
+        if point is not None:
+            points.append(point)
+    return points
+
+
+def _to_number(text, kind):
+    return kind(text) if text is not None else None
+
+
+class LogTail:
+    """增量读取日志文件
+
+    记住已读取的字节偏移量，每次只读取新增部分并按行返回，
+    不完整的末行留到下次读取；文件被截断或重建时从头开始，
+    并把truncated置为True（由调用方检查后清除），以便丢弃之前读取的内容。
+    """
+
+    def __init__(self, path, encoding=LOG_ENCODING, from_end=False):
+        self.path = path
+        self.encoding = encoding
+        self.offset = 0
+        self._partial = b""
+        self.truncated = False
+        if from_end and os.path.exists(path):
+            self.offset = os.path.getsize(path)
+
+    def read_lines(self):
+        """返回自上次读取以来新增的完整行"""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return []
+        if size < self.offset:
+            # 文件被截断或重新生成
+            self.offset = 0
+            self._partial = b""
+            self.truncated = True
+        if size == self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset += len(data)
+
+        data = self._partial + data
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        return [line.rstrip(b"\r").decode(self.encoding, errors="replace") for line in lines]
+
+    def flush(self):
+        """返回缓存的不完整末行（进程结束后调用）"""
+        partial, self._partial = self._partial, b""
+        if not partial:
+            return []
+        return [partial.rstrip(b"\r").decode(self.encoding, errors="replace")]
+
+
+def kill_process_tree(process):
+    """终止进程及其子进程"""
+    if os.name == 'nt':
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+    else:
+        os.killpg(process.pid, signal.SIGTERM)
+
+
+class SolverRunner:
+    """异步运行外部求解器并采集进度
+
+    不经过shell直接启动求解器，由后台线程读取stdout/stderr与日志文件，
+    按GBK解码后解析目标值，进度点保存在定长环形缓冲区中。
+    所有事件放入线程安全的队列，由GUI线程通过after()定时取出：
+        ("line", 来源, 文本)、("progress", ProgressPoint)、("exit", 返回码)
+    """
+
+    def __init__(self, command, cwd=None, log_path=None, history=5000, encoding=LOG_ENCODING):
+        self.command = list(command)
+        self.cwd = cwd
+        self.log_path = log_path
+        self.encoding = encoding
+        self.points = deque(maxlen=history)  # 进度点环形缓冲区
+        self.events = queue.Queue()
+        self.process = None
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._threads = []
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """启动求解器与采集线程"""
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True  # 便于整体终止进程组
+
+        # 只读取本次运行新写入的日志内容
+        log_tail = LogTail(self.log_path, self.encoding, from_end=True) if self.log_path else None
+        self.process = subprocess.Popen(
+            self.command,
+            cwd=self.cwd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **kwargs
+        )
+        self._threads = [
+            threading.Thread(target=self._read_stream, args=(self.process.stdout, "stdout"), daemon=True),
+            threading.Thread(target=self._read_stream, args=(self.process.stderr, "stderr"), daemon=True),
+        ]
+        if log_tail is not None:
+            self._threads.append(threading.Thread(target=self._tail_log, args=(log_tail,), daemon=True))
+        self._threads.append(threading.Thread(target=self._wait_exit, daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """终止求解器进程树并等待退出"""
+        if not self.running:
+            return False
+        kill_process_tree(self.process)
+        self.process.wait(timeout=timeout)
+        return True
+
+    def drain(self, limit=1000):
+        """非阻塞取出队列中的事件（供GUI线程调用）"""
+        items = []
+        try:
+            while len(items) < limit:
+                items.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
+    def best_objective(self):
+        """当前记录到的最优可行目标值"""
+        values = [p.objective for p in list(self.points) if p.objective < INFEASIBLE]
+        return min(values) if values else None
+
+    # ----------------- 后台线程 -----------------
+    def _handle_line(self, source, text):
+        self.events.put(("line", source, text))
+        with self._lock:
+            point = parse_progress_line(text, self._seq)
+            if point is None:
+                return
+            self._seq += 1
+        self.points.append(point)
+        self.events.put(("progress", point))
+
+    def _read_stream(self, stream, source):
+        for raw in iter(stream.readline, b""):
+            self._handle_line(source, raw.rstrip(b"\r\n").decode(self.encoding, errors="replace"))
+        stream.close()
+
+    def _tail_log(self, log_tail):
+        while True:
+            finished = self.process.poll() is not None
+            for line in log_tail.read_lines():
+                self._handle_line("log", line)
+            if finished:
+                for line in log_tail.flush():
+                    self._handle_line("log", line)
+                return
+            time.sleep(LOG_POLL_INTERVAL)
+
+    def _wait_exit(self):
+        returncode = self.process.wait()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+        self.events.put(("exit", returncode))
@@ -0,0 +1,1041 @@
+# steel_casting.py
+import glob
+import json
+import os
+import subprocess
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, messagebox, filedialog
+
+import matplotlib
+import numpy as np
+from matplotlib import pyplot as plt
+
+matplotlib.use('TkAgg')
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Rectangle
+from matplotlib.ticker import MaxNLocator
+
+import cp_log
+import file_watcher
+from batch_runner import BatchRunner
+from gui_common import SolverStatusBar, after_future
+from instance_loader import load_instance
+from schedule_compare import ScheduleComparison, incompatibility
+from schedule_evaluator import ScheduleEvaluator
+from schedule_model import ScheduleModel
+from schedule_propagation import PrecedenceGraph
+from solver_runner import INFEASIBLE, LogTail, SolverRunner, parse_progress_line, read_progress_file
+from virtual_table import VirtualTable
+
+RESULT_PATH = "Data/SCC_RES/result.json"  # 求解器输出的排程结果
+GANTT_DETAIL_LIMIT = 2000  # 甘特图可视范围内逐块绘制的任务块上限，超过则按设备合并显示
+COMPARE_COLORS = ("orange", "purple", "green", "brown", "magenta")  # 对比方案的轮廓颜色
+
+
+class ConvergencePanel(ttk.Frame):
+    """收敛曲线面板：按偏移量增量读取日志，只用blit重绘曲线"""
+    POLL_MS = 1000
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        logs = ["Data/log.txt"] + sorted(glob.glob("Data/dc*ResLog*.txt"))
+
+        # 日志选择与对比按钮
+        control = ttk.Frame(self)
+        control.pack(fill="x", padx=5, pady=2)
+        ttk.Label(control, text="日志文件:").pack(side="left")
+        self.log_var = tk.StringVar(value=logs[0])
+        selector = ttk.Combobox(control, textvariable=self.log_var, values=logs, state="readonly", width=36)
+        selector.pack(side="left", padx=5)
+        selector.bind("<<ComboboxSelected>>", lambda e: self.open_log(self.log_var.get()))
+        ttk.Button(control, text="叠加对比", command=self.add_comparison).pack(side="left", padx=2)
+        ttk.Button(control, text="清除对比", command=self.clear_comparison).pack(side="left", padx=2)
+
+        self.fig = Figure(figsize=(8, 3), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_xlabel("变动序号")
+        self.ax.set_ylabel("目标值")
+        self.ax.grid(True, linestyle='--')
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        # 当前日志曲线为动画对象，普通重绘不包含它，由blit单独绘制
+        self.line, = self.ax.plot([], [], color="#4B8BBE", animated=True)
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.comparisons = []
+
+        # 预分配的数据缓冲区，写满时容量翻倍
+        self.xs = np.empty(1024)
+        self.ys = np.empty(1024)
+        self.count = 0
+        self.tail = None
+
+        self.open_log(self.log_var.get())
+        self.after(self.POLL_MS, self._poll)
+
+    def open_log(self, path):
+        """切换跟踪的日志文件，从头读取已有内容"""
+        self.count = 0
+        self.tail = LogTail(path)
+        self._append(self.tail.read_lines())
+        self._rescale()
+
+    def add_comparison(self):
+        """把当前选择的日志完整曲线作为静态对比线叠加"""
+        path = self.log_var.get()
+        values = [p.objective for p in read_progress_file(path) if p.objective < INFEASIBLE]
+        line, = self.ax.plot(np.arange(len(values)), values, linewidth=1, label=os.path.basename(path))
+        self.comparisons.append(line)
+        self.ax.legend(loc="upper right", fontsize=8)
+        self._rescale()
+
+    def clear_comparison(self):
+        for line in self.comparisons:
+            line.remove()
+        self.comparisons = []
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        self._rescale()
+
+    def _poll(self):
+        """定时读取日志新增行，日志被新的运行截断时重新开始曲线"""
+        if self.tail is not None:
+            lines = self.tail.read_lines()
+            if self.tail.truncated:
+                self.tail.truncated = False
+                self.count = 0
+                self._append(lines)
+                self._rescale()
+            elif self._append(lines):
+                self._redraw()
+        self.after(self.POLL_MS, self._poll)
+
+    def _append(self, lines):
+        """解析新增行并写入缓冲区，返回新增的点数"""
+        values = [p.objective for p in map(parse_progress_line, lines)
+                  if p is not None and p.objective < INFEASIBLE]
+        needed = self.count + len(values)
+        if needed > len(self.ys):
+            capacity = max(needed, len(self.ys) * 2)
+            self.xs = np.resize(self.xs, capacity)
+            self.ys = np.resize(self.ys, capacity)
+        self.xs[self.count:needed] = np.arange(self.count, needed)
+        self.ys[self.count:needed] = values
+        self.count = needed
+        self.line.set_data(self.xs[:needed], self.ys[:needed])
+        return len(values)
+
+    def _redraw(self):
+        """数据仍在坐标范围内时只blit曲线，否则重新设置范围并完整重绘"""
+        x1 = self.ax.get_xlim()[1]
+        y0, y1 = self.ax.get_ylim()
+        latest = self.ys[:self.count]
+        if self.background is None or self.count > x1 or latest.min() < y0 or latest.max() > y1:
+            self._rescale()
+            return
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
+
+    def _rescale(self):
+        """根据所有曲线设置坐标范围（横轴预留余量以减少完整重绘）"""
+        series = [self.ys[:self.count]] + [line.get_ydata() for line in self.comparisons]
+        series = [np.asarray(values, dtype=float) for values in series if len(values)]
+        if series:
+            length = max(len(values) for values in series)
+            low = min(values.min() for values in series)
+            high = max(values.max() for values in series)
+            margin = max((high - low) * 0.05, 1)
+            self.ax.set_xlim(0, max(length * 1.2, 10))
+            self.ax.set_ylim(low - margin, high + margin)
+        self.canvas.draw_idle()
+
+    def _on_draw(self, event):
+        """完整重绘后缓存背景并补画动画曲线"""
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
+
+
+class CpLogPanel(ttk.Frame):
+    """CP求解日志分析：扫描Data/cpLog下所有日志，显示各实例的Gap曲线与达到最优值的时间"""
+    GRID_POINTS = 500  # Gap曲线的时间网格点数
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.table = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cp-log")
+
+        control = ttk.Frame(self)
+        control.pack(fill="x", padx=5, pady=2)
+        ttk.Label(control, text="实例:").pack(side="left")
+        self.instance_var = tk.StringVar()
+        self.selector = ttk.Combobox(control, textvariable=self.instance_var, state="readonly", width=10)
+        self.selector.pack(side="left", padx=5)
+        self.selector.bind("<<ComboboxSelected>>", lambda e: self.show_instance())
+        ttk.Button(control, text="重新扫描", command=self.rescan).pack(side="left", padx=2)
+
+        self.fig = Figure(figsize=(8, 2.5), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        # 各日志的汇总
+        columns = {
+            "instance": ("实例", 60), "variant": ("变体", 110), "points": ("点数", 60),
+            "final": ("最终目标值", 100), "best": ("实例最优值", 100),
+            "ttt": ("达到最优用时(秒)", 120), "gap": ("最终Gap", 90),
+        }
+        self.summary = VirtualTable(self, columns=tuple(columns))
+        for col, (text, width) in columns.items():
+            self.summary.heading(col, text=text)
+            self.summary.column(col, width=width, anchor="center")
+        self.summary.pack(fill="x")
+
+        # 首次显示时才扫描
+        self.bind("<Map>", self._on_map)
+
+    def _on_map(self, event):
+        self.unbind("<Map>")
+        self.rescan()
+
+    def rescan(self):
+        """在后台重新扫描日志（未变化的文件使用缓存）"""
+        after_future(self, self.executor.submit(cp_log.scan), self._show_table)
+
+    def _show_table(self, table):
+        self.table = table
+        best = table.best_objective()
+        ttt = table.time_to_target(best)
+        rows = []
+        for (instance, variant, start, end), reached in zip(table.series, ttt.tolist()):
+            rows.append((instance, variant or "CP", end - start, int(table.objective[end - 1]), best[instance],
+                         "未达到" if np.isnan(reached) else f"{reached:g}", f"{table.gap[end - 1]:g}"))
+        self.summary.set_rows(rows)
+
+        instances = sorted(best)
+        self.selector["values"] = instances
+        if instances and self.instance_var.get() not in {str(i) for i in instances}:
+            self.instance_var.set(instances[0])
+        self.show_instance()
+
+    def show_instance(self):
+        """绘制所选实例各变体的Gap随时间变化曲线"""
+        self.ax.clear()
+        self.ax.set_xlabel("时间（秒）")
+        self.ax.set_ylabel("Gap")
+        self.ax.grid(True, linestyle='--')
+        if self.table is not None and len(self.table) and self.instance_var.get():
+            instance = int(self.instance_var.get())
+            grid = np.linspace(0, self.table.time.max(), self.GRID_POINTS)
+            curves = self.table.gap_curves(grid)
+            for curve, (series_instance, variant, _, _) in zip(curves, self.table.series):
+                if series_instance == instance and not np.all(np.isnan(curve)):
+                    self.ax.plot(grid, curve, drawstyle="steps-post", label=variant or "CP")
+            if self.ax.lines:
+                self.ax.legend(loc="upper right", fontsize=8)
+        self.canvas.draw_idle()
+
+
+class KpiPanel(ttk.Frame):
+    """排程指标：总体指标、各设备利用率与空闲、各浇次断浇与开浇偏差
+
+    指标随排程结果缓存（ScheduleModel.kpi），只在页面显示时刷新。
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.model = None
+        self.get_instance = None
+        self.kpi = None  # 当前显示的指标
+
+        self.summary_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.summary_var, justify="left").pack(fill="x", padx=5, pady=5)
+
+        tables = ttk.Frame(self)
+        tables.pack(fill="both", expand=True)
+        machine_columns = {
+            "machine": ("设备", 70), "blocks": ("任务块数", 70), "busy": ("加工时间", 90),
+            "idle": ("空闲时间", 90), "max_idle": ("最大空闲", 90), "utilization": ("利用率", 70),
+        }
+        cast_columns = {
+            "cast": ("浇次", 60), "charges": ("炉次数", 60), "caster": ("连铸机", 60),
+            "start": ("开浇时间", 90), "eat": ("最早可用", 90), "deviation": ("开浇偏差", 90),
+            "breaks": ("断浇次数", 70), "break_time": ("断浇时间", 90),
+        }
+        self.machine_table = self._make_table(tables, machine_columns)
+        self.cast_table = self._make_table(tables, cast_columns)
+
+        self.bind("<Map>", lambda e: self.refresh())
+
+    def _make_table(self, parent, columns):
+        table = VirtualTable(parent, columns=tuple(columns))
+        for col, (text, width) in columns.items():
+            table.heading(col, text=text)
+            table.column(col, width=width, anchor="center")
+        table.pack(side="left", fill="both", expand=True, padx=2)
+        return table
+
+    def show(self, model, get_instance):
+        """设置排程结果，get_instance返回对应算例（可为None），页面可见时立即刷新"""
+        self.model = model
+        self.get_instance = get_instance
+        if self.winfo_ismapped():
+            self.refresh()
+
+    def refresh(self):
+        if self.model is None:
+            return
+        try:
+            kpi = self.model.kpi(self.get_instance())
+        except IndexError:
+            # 算例与排程结果不匹配（设备号超出范围），不使用算例数据
+            kpi = self.model.kpi()
+        if kpi is self.kpi:
+            return
+        self.kpi = kpi
+
+        s = kpi.summary()
+        deviation = "无算例数据" if np.isnan(s["max_deviation"]) else f"{s['max_deviation']:g}"
+        self.summary_var.set("\n".join([
+            f"完工时间：{s['makespan']:g}  排程跨度：{s['horizon']:g}  平均设备利用率：{s['utilization']:.1%}",
+            f"设备空闲时间：{s['idle']:g}  阶段间等待：{s['wait']:g}（平均{s['mean_wait']:.1f}，最大{s['max_wait']:g}）",
+            f"断浇：{s['cast_breaks']}次，共{s['cast_break_time']:g}  最大开浇偏差：{deviation}",
+        ]))
+        self.machine_table.set_rows(zip(
+            kpi.machines.tolist(), kpi.machine_blocks.tolist(), kpi.machine_busy.tolist(),
+            kpi.machine_idle.tolist(), kpi.machine_max_idle.tolist(),
+            [f"{u:.1%}" for u in kpi.utilization.tolist()]))
+        self.cast_table.set_rows(zip(
+            kpi.casts.tolist(), kpi.cast_charges.tolist(), kpi.cast_machine.tolist(), kpi.cast_start.tolist(),
+            [_format_optional(t) for t in kpi.cast_eat.tolist()],
+            [_format_optional(t) for t in kpi.cast_deviation.tolist()],
+            kpi.cast_breaks.tolist(), kpi.cast_break_time.tolist()))
+
+
+def _format_optional(value):
+    return "-" if np.isnan(value) else f"{value:g}"
+
+
+class SteelCastingModule(tk.Frame):
+    """炼钢连铸模块"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.configure(background="#E8F5E9")
+        self.runner = None  # 炼钢连铸程序运行器
+        self.batch = None   # 批量运行器
+        self.batch_table = None
+        self.highlight_items = set()  # 存储高亮项的ID
+        self.block_collection = None  # 甘特图任务块集合
+        self.visible_blocks = np.empty(0, dtype=int)  # 明细模式下绘制的任务块下标
+        self.model = ScheduleModel.from_blocks([])  # 排程结果数据模型
+        self.gantt_colors = None  # 各任务块的填充颜色
+        self.propagation = None  # 拖动编辑使用的约束图，首次拖动时建立
+        self._instance = None  # (算例路径, 算例)，首次使用时加载
+        self.drag = None  # 正在拖动的任务块状态
+        self.comparison = None  # 方案对比，第一个为当前结果
+        self.compare_table = None
+        # 正确初始化顺序
+        self.create_widgets()      # 先创建子控件
+        self.setup_gantt_interaction()  # 再设置交互
+        self.load_settings()
+        self.after_idle(self.load_result)  # 先显示界面，再加载结果并绘制甘特图
+        # 求解器写出新结果后自动刷新
+        file_watcher.shared().watch(RESULT_PATH, ScheduleModel.from_json, self.show_result, self)
+
+    def setup_gantt_interaction(self):
+        """设置图表交互事件"""
+        # 绑定到 matplotlib canvas
+        self.canvas.mpl_connect("button_press_event", self.on_press)
+        self.canvas.mpl_connect("motion_notify_event", self.on_motion)
+        self.canvas.mpl_connect("button_release_event", self.on_release)
+
+        # 初始化交互状态
+        self.zoom_rect = None
+        self.zoom_background = None  # 拖动缩放时缓存的图表背景
+        self.press_start = None
+        self.xlim = self.ax.get_xlim()
+
+    def create_widgets(self):
+        """创建三个子模块"""
+        # 参数配置模块
+        param_frame = ttk.LabelFrame(self, text="参数配置与程序启动")
+        param_frame.pack(fill="x", padx=10, pady=5)
+        self.create_param_controls(param_frame)
+
+        # 甘特图模块
+        self.gantt_frame = ttk.LabelFrame(self, text="生产计划甘特图")
+        self.gantt_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.create_gantt_chart()
+
+        # 数据表格模块
+        table_frame = ttk.LabelFrame(self, text="生产数据明细")
+        table_frame.pack(fill="both", padx=10, pady=5)
+        self.create_data_table(table_frame)
+
+    def create_param_controls(self, parent):
+        """参数输入控件"""
+        params = ["Start", "End", "Diff", "time_limit"]
+        self.entries = {}
+
+        for i, param in enumerate(params):
+            row = ttk.Frame(parent)
+            row.pack(fill="x", padx=5, pady=2)
+
+            ttk.Label(row, text=param + ":", width=12).pack(side="left")
+            entry = ttk.Entry(row, width=10)
+            entry.pack(side="left", padx=5)
+            self.entries[param] = entry
+
+        # 按钮组
+        btn_frame = ttk.Frame(parent)
+        btn_frame.pack(pady=5)
+        ttk.Button(btn_frame, text="保存配置", command=self.save_settings).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="执行程序", command=self.run_program).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="中止执行", command=self.stop_program).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="批量运行", command=self.run_batch).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="批量结果", command=self.show_batch_summary).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="校验结果", command=self.check_result).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="方案对比", command=self.compare_schedules).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="退出对比", command=self.clear_comparison).pack(side="left", padx=5)
+
+        # 运行进度
+        self.status_bar = SolverStatusBar(parent)
+        self.status_bar.pack(fill="x", padx=5, pady=2)
+
+    def create_gantt_chart(self):
+        """创建甘特图画布、收敛曲线页与CP日志分析页"""
+        chart_book = ttk.Notebook(self.gantt_frame)
+        chart_book.pack(fill="both", expand=True)
+
+        gantt_page = ttk.Frame(chart_book)
+        chart_book.add(gantt_page, text="甘特图")
+        self.fig = Figure(figsize=(8, 4), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=gantt_page)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        self.convergence = ConvergencePanel(chart_book)
+        chart_book.add(self.convergence, text="收敛曲线")
+
+        self.cp_log_panel = CpLogPanel(chart_book)
+        chart_book.add(self.cp_log_panel, text="CP日志分析")
+
+        self.kpi_panel = KpiPanel(chart_book)
+        chart_book.add(self.kpi_panel, text="排程指标")
+
+    def create_data_table(self, parent):
+        """创建数据表格"""
+        self.tree = VirtualTable(parent, columns=("cast", "charge", "machine", "start", "end"),
+                                 row_tags=self._row_tags)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.tag_configure("highlight", background="#FFCDD2")
+        self.tree.tag_configure("violation", background="#E1BEE7")
+
+        # 配置表头
+        columns = {
+            "cast": "浇次号",
+            "charge": "炉次号",
+            "machine": "设备号",
+            "start": "开始时间",
+            "end": "结束时间"
+        }
+        for col, text in columns.items():
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=80, anchor="center")
+
+        # 绑定点击事件
+        self.tree.bind("<<TreeviewSelect>>", self.on_table_select)
+
+    def _row_tags(self, index):
+        """数据表格行标签：高亮的任务块"""
+        if self.model.highlight[index]:
+            return ("highlight",)
+        return ("violation",) if self.model.violations[index] else ()
+
+    # ----------------- 数据操作相关方法 -----------------
+    def load_settings(self):
+        """加载配置文件"""
+        try:
+            with open("Data/setting.json") as f:
+                self.settings = json.load(f)
+                for key, entry in self.entries.items():
+                    entry.delete(0, tk.END)
+                    entry.insert(0, str(self.settings.get(key, "")))
+        except Exception as e:
+            messagebox.showerror("错误", f"无法读取配置文件:\n{str(e)}")
+
+    def save_settings(self):
+        """保存配置文件"""
+        try:
+            for key, entry in self.entries.items():
+                self.settings[key] = int(entry.get())
+
+            with open("Data/setting.json", "w") as f:
+                json.dump(self.settings, f, indent=4)
+
+            messagebox.showinfo("成功", "配置保存成功")
+        except Exception as e:
+            messagebox.showerror("错误", f"保存失败:\n{str(e)}")
+
+    def load_result(self):
+        """加载结果数据"""
+        try:
+            self.show_result(ScheduleModel.from_json(RESULT_PATH))
+        except Exception as e:
+            messagebox.showerror("错误", f"无法读取结果文件:\n{str(e)}")
+
+    def show_result(self, model):
+        """显示新的排程结果（拖动中则等拖动结束）"""
+        if self.drag is not None:
+            self.after(200, self.show_result, model)
+            return
+        self.model = model
+        self.propagation = None
+        self._instance = None
+        self.update_gantt()
+        self.update_table()
+        self.kpi_panel.show(model, self._load_instance)
+
+    def check_result(self):
+        """按算例数据校验当前排程结果，标记违反约束的任务块（不影响手动高亮）"""
+        try:
+            instance_no, path = self._instance_path()
+            evaluator = ScheduleEvaluator(load_instance(path),
+                                          self.model.column("charge"), self.model.column("machine"))
+            result = evaluator.evaluate(self.model.starts, self.model.ends)
+            self.model.violations[:] = evaluator.block_violations(self.model.starts, self.model.ends)
+        except Exception as e:
+            messagebox.showerror("错误", f"校验失败:\n{str(e)}")
+            return
+
+        self.update_highlight()
+        self.tree.refresh()
+        lines = [
+            f"算例：instance{instance_no}",
+            f"完工时间：{result['makespan']:g}",
+            f"等待时间：{result['wait']:g}  加工偏差：{result['deviation']:g}",
+            f"工艺路线：{result['route']}  连铸机：{result['caster']}  断浇：{result['cast_break']}",
+            f"运输不足：{result['transport']:g}  加工过短：{result['min_time']:g}  加工过长：{result['max_time']:g}",
+            f"早于可用时间：{result['eat']:g}  设备重叠：{result['overlap']:g}",
+        ]
+        if result["feasible"]:
+            messagebox.showinfo("校验结果", "\n".join(["排程满足全部约束"] + lines))
+        else:
+            messagebox.showwarning("校验结果", "\n".join(["排程违反约束，相关任务块已用紫色标出"] + lines))
+
+    def _instance_path(self):
+        """当前结果对应的算例编号与文件路径"""
+        instance_no = self.settings.get("Last_Ins", self.settings.get("Start"))
+        path = os.path.join(self.settings.get("instance_path", "Data/SCC_DATA/"), f"instance{instance_no}.json")
+        return instance_no, path
+
+    def _load_instance(self):
+        """当前结果对应的算例（按路径缓存），算例文件不可用时返回None"""
+        path = self._instance_path()[1]
+        if self._instance is None or self._instance[0] != path:
+            try:
+                instance = load_instance(path)
+            except Exception:
+                instance = None
+            self._instance = (path, instance)
+        return self._instance[1]
+
+    def _get_propagation(self):
+        """建立拖动编辑的约束图，算例文件不可用时不考虑运输时间"""
+        if self.propagation is None:
+            self.propagation = PrecedenceGraph(self.model, self._load_instance())
+        return self.propagation
+
+    # ----------------- 程序执行控制 -----------------
+    def run_program(self):
+        """执行主程序（后台采集输出与日志进度）"""
+        if self.runner and self.runner.running:
+            messagebox.showwarning("警告", "程序已在运行中")
+            return
+
+        try:
+            self.runner = SolverRunner([os.path.abspath("main.exe")], log_path="Data/log.txt").start()
+            self.status_bar.attach(self.runner)
+        except Exception as e:
+            messagebox.showerror("错误", f"程序启动失败:\n{str(e)}")
+
+    def stop_program(self):
+        if self.batch is not None and self.batch.running:
+            self.batch.cancel()
+            messagebox.showinfo("提示", "批量运行已中止")
+            return
+        if self.runner is None or not self.runner.running:
+            messagebox.showinfo("提示", "没有正在运行的程序")
+            return
+
+        try:
+            # 终止进程树并等待进程终止，避免状态误判
+            self.runner.stop(timeout=5)
+            messagebox.showinfo("提示", "程序已中止")
+
+        except subprocess.TimeoutExpired:
+            messagebox.showerror("错误", "中止失败：进程未在指定时间内终止")
+        except subprocess.CalledProcessError as e:
+            messagebox.showerror("错误", f"中止失败（命令执行错误）:\n{str(e)}")
+        except Exception as e:
+            messagebox.showerror("错误", f"中止失败:\n{str(e)}")
+
+    # ----------------- 批量运行 -----------------
+    def run_batch(self):
+        """按[Start, End)范围并行运行多个实例，每个CPU核一个求解器进程"""
+        if (self.batch is not None and self.batch.running) or (self.runner and self.runner.running):
+            messagebox.showwarning("警告", "程序已在运行中")
+            return
+
+        try:
+            instances = range(int(self.entries["Start"].get()), int(self.entries["End"].get()))
+            time_limit = int(self.entries["time_limit"].get())
+            self.batch = BatchRunner("main.exe", instances, self.settings, time_limit=time_limit).start()
+        except Exception as e:
+            messagebox.showerror("错误", f"批量运行启动失败:\n{str(e)}")
+            return
+
+        self.status_bar.status_var.set(f"批量运行中：共{len(instances)}个实例")
+        self.show_batch_summary()
+        self.after(500, self._poll_batch)
+
+    def _poll_batch(self):
+        """取出批量运行事件并刷新汇总表"""
+        for kind, payload in self.batch.drain():
+            if kind == "finished":
+                self._refresh_batch_table()
+                self.status_bar.status_var.set(
+                    f"批量运行中：已完成{len(self.batch.results)}/{len(self.batch.instances)}个实例")
+            elif kind == "done":
+                self._refresh_batch_table()
+                self.status_bar.status_var.set(f"批量运行结束：共{len(self.batch.results)}个实例")
+                return
+        self.after(500, self._poll_batch)
+
+    def show_batch_summary(self):
+        """显示批量运行汇总表"""
+        if self.batch_table is not None and self.batch_table.winfo_exists():
+            self.batch_table.winfo_toplevel().lift()
+            self._refresh_batch_table()
+            return
+
+        window = tk.Toplevel(self)
+        window.title("批量运行结果")
+        columns = {
+            "instance": "实例",
+            "status": "状态",
+            "objective": "目标值",
+            "makespan": "完工时间",
+            "blocks": "任务块数",
+            "wall_time": "用时（秒）",
+            "error": "错误信息"
+        }
+        self.batch_table = VirtualTable(window, columns=tuple(columns))
+        for col, text in columns.items():
+            self.batch_table.heading(col, text=text)
+            self.batch_table.column(col, width=90, anchor="center")
+        self.batch_table.column("error", width=240, anchor="w")
+        self.batch_table.pack(fill="both", expand=True)
+        self._refresh_batch_table()
+
+    def _refresh_batch_table(self):
+        if self.batch_table is None or not self.batch_table.winfo_exists() or self.batch is None:
+            return
+        self.batch_table.set_rows(
+            (r.instance, r.status, "" if r.objective is None else r.objective,
+             "" if r.makespan is None else f"{r.makespan:g}", r.blocks, f"{r.wall_time:.1f}", r.error or "")
+            for r in self.batch.summary()
+        )
+
+    # ----------------- 方案对比 -----------------
+    def compare_schedules(self):
+        """选择一个或多个结果文件，与当前结果对比并叠加显示在甘特图上"""
+        paths = filedialog.askopenfilenames(title="选择要对比的排程结果", initialdir="Data/SCC_SOLU",
+                                            filetypes=[("JSON文件", "*.json")])
+        if not paths:
+            return
+        try:
+            models = [ScheduleModel.from_json(path) for path in paths]
+        except Exception as e:
+            messagebox.showerror("错误", f"无法读取结果文件:\n{str(e)}")
+            return
+
+        # 只对比同一算例的结果
+        names, compatible, rejected = [], [], []
+        for path, model in zip(paths, models):
+            reason = incompatibility(self.model, model)
+            if reason is None:
+                names.append(os.path.basename(path))
+                compatible.append(model)
+            else:
+                rejected.append(f"{os.path.basename(path)}：{reason}")
+        if rejected:
+            messagebox.showwarning("警告", "以下结果与当前结果不是同一算例，未参与对比:\n" + "\n".join(rejected))
+        if not compatible:
+            return
+        self.comparison = ScheduleComparison([self.model] + compatible, ["当前结果"] + names)
+        self.update_gantt()
+        self.show_comparison_summary()
+
+    def clear_comparison(self):
+        if self.comparison is None:
+            return
+        self.comparison = None
+        if self.compare_table is not None and self.compare_table.winfo_exists():
+            self.compare_table.winfo_toplevel().destroy()
+        self.update_gantt()
+
+    def draw_comparison(self):
+        """把对比方案的任务块画成轮廓叠加在当前结果上，有变化的任务块加粗"""
+        if self.comparison is None:
+            return
+        # 当前结果可能已被编辑或重新加载，重新对齐；换成其他算例的结果时不再对比
+        others = [(name, model) for name, model in zip(self.comparison.names[1:], self.comparison.models[1:])
+                  if incompatibility(self.model, model) is None]
+        if not others:
+            self.comparison = None
+            return
+        comparison = ScheduleComparison([self.model] + [model for _, model in others],
+                                        self.comparison.names[:1] + [name for name, _ in others])
+        self.comparison = comparison
+        machines = self.model.machines
+        for j in range(1, len(comparison.models)):
+            # 只画在当前结果中存在的设备行上
+            shown = comparison.present[j] & np.isin(comparison.machine[j], machines)
+            rows = np.searchsorted(machines, comparison.machine[j][shown]) + 1
+            collection = PolyCollection(
+                gantt_block_verts(comparison.start[j][shown], comparison.end[j][shown], rows, height=0.5),
+                facecolors="none", edgecolors=COMPARE_COLORS[(j - 1) % len(COMPARE_COLORS)],
+                linewidths=np.where(comparison.changed[j][shown], 1.5, 0.5), label=comparison.names[j])
+            self.ax.add_collection(collection)
+        self.ax.legend(loc="upper right", fontsize=8)
+        self._refresh_comparison_table()
+
+    def show_comparison_summary(self):
+        """显示各方案相对当前结果的差异汇总"""
+        if self.compare_table is not None and self.compare_table.winfo_exists():
+            self.compare_table.winfo_toplevel().lift()
+            self._refresh_comparison_table()
+            return
+
+        window = tk.Toplevel(self)
+        window.title("方案对比")
+        columns = {
+            "name": "方案",
+            "blocks": "任务块数",
+            "makespan": "完工时间",
+            "makespan_delta": "完工时间变化",
+            "idle": "空闲时间",
+            "idle_delta": "空闲时间变化",
+            "moved": "换设备",
+            "shifted": "时间变化",
+            "max_shift": "最大偏移",
+            "missing": "缺少",
+            "extra": "多出"
+        }
+        self.compare_table = VirtualTable(window, columns=tuple(columns))
+        for col, text in columns.items():
+            self.compare_table.heading(col, text=text)
+            self.compare_table.column(col, width=90, anchor="center")
+        self.compare_table.pack(fill="both", expand=True)
+        self._refresh_comparison_table()
+
+    def _refresh_comparison_table(self):
+        if self.compare_table is None or not self.compare_table.winfo_exists() or self.comparison is None:
+            return
+        self.compare_table.set_rows(
+            (r["name"], r["blocks"], f"{r['makespan']:g}", f"{r['makespan_delta']:+g}", f"{r['idle']:g}",
+             f"{r['idle_delta']:+g}", r["moved"], r["shifted"], f"{r['max_shift']:g}", r["missing"], r["extra"])
+            for r in self.comparison.summary()
+        )
+
+    # ----------------- 可视化更新方法 -----------------
+    def update_gantt(self):
+        plt.rcParams['font.sans-serif'] = ['Microsoft YaHei']  # 使用微软雅黑
+        plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
+        """更新甘特图（数据变化时整体重建，高亮变化使用update_highlight）"""
+        self.ax.clear()
+        self.zoom_rect = None
+        self.block_collection = None
+        self.gantt_colors = None
+        model = self.model
+
+        # 设备列表与行号由数据模型预先计算
+        machines = model.machines.tolist()
+        y_ticks = [i + 1 for i in range(len(machines))]
+        self.ax.set_yticks(y_ticks)
+        self.ax.set_yticklabels([f"设备 {m}" for m in machines])
+        if not len(model):
+            self.canvas.draw_idle()
+            return
+
+        # 计算时间范围
+        xmin, xmax = model.time_range()
+
+        # 设置坐标轴范围
+        self.ax.set_ylim(0.5, len(machines) + 0.5)  # 增加垂直缩进
+        self.ax.set_xlim(xmin - 50, xmax + 50)  # 增加水平缩进
+        # 刻度密度随可视范围自动调整
+        self.ax.xaxis.set_major_locator(MaxNLocator(nbins="auto", steps=[1, 2, 2.5, 5, 10], integer=True))
+        # 设置颜色映射
+        colors = plt.get_cmap('tab20', len(model.charges))
+        self.gantt_colors = colors(model.charge_code)
+
+        # 明细模式：可视范围内的任务块合并为一个PolyCollection
+        self.block_collection = PolyCollection([], edgecolors='black', linewidths=0.5)
+        # 概览模式：按设备合并后的占用区间与空闲区间
+        self.busy_collection = PolyCollection([], facecolors='#4B8BBE', edgecolors='none')
+        self.idle_collection = PolyCollection([], facecolors='#E0E0E0', edgecolors='none')
+        for collection in (self.idle_collection, self.busy_collection, self.block_collection):
+            self.ax.add_collection(collection)
+        self.draw_comparison()
+
+        # 设置图表样式
+        self.ax.set_xlabel("时间（分钟）")
+        self.ax.grid(True, axis='x', linestyle='--')
+        self.fig.tight_layout()
+        self.xlim = self.ax.get_xlim()
+        self.render_gantt_view()
+
+    def render_gantt_view(self):
+        """按当前可视范围选择细节层级并更新图形
+
+        可视范围内的任务块不超过GANTT_DETAIL_LIMIT时逐块绘制，
+        否则按设备合并为占用/空闲区间，缩放到局部后再恢复明细。
+        """
+        if self.gantt_colors is None:
+            self.canvas.draw_idle()
+            return
+        model = self.model
+        x0, x1 = self.ax.get_xlim()
+        visible = model.in_window(x0, x1)
+
+        if len(visible) <= GANTT_DETAIL_LIMIT:
+            self.visible_blocks = visible
+            self.block_collection.set_verts(gantt_block_verts(
+                model.starts[visible], model.ends[visible], model.machine_row[visible]))
+            self.block_collection.set_facecolors(self.gantt_colors[visible])
+            self.busy_collection.set_verts([])
+            self.idle_collection.set_verts([])
+            self.update_highlight(redraw=False)
+        else:
+            self.visible_blocks = visible[:0]
+            self.block_collection.set_verts([])
+            # 小于一个像素的空隙直接并入占用区间
+            min_gap = (x1 - x0) / max(self.ax.bbox.width, 1)
+            busy, idle = model.merged_intervals(visible, min_gap)
+            self.busy_collection.set_verts(gantt_block_verts(busy[1], busy[2], busy[0]))
+            self.idle_collection.set_verts(gantt_block_verts(idle[1], idle[2], idle[0], height=0.3))
+        self.canvas.draw_idle()
+
+    def update_highlight(self, redraw=True):
+        """原地更新任务块的高亮边框，不重建图形"""
+        if self.block_collection is None:
+            return
+        edgecolors, marked = self._edge_style(self.visible_blocks)
+        self.block_collection.set_edgecolors(edgecolors)
+        self.block_collection.set_linewidths(np.where(marked, 2, 0.5))
+        if redraw:
+            self.canvas.draw_idle()
+
+    def _edge_style(self, indices):
+        """任务块边框颜色与是否加粗：手动高亮为红色，违反约束为紫色"""
+        highlight = self.model.highlight[indices]
+        violations = self.model.violations[indices]
+        edgecolors = np.where(violations[:, None], to_rgba('purple'), to_rgba('black'))
+        edgecolors[highlight] = to_rgba('red')
+        return edgecolors, highlight | violations
+
+    def update_table(self, keep_view=False):
+        """更新数据表格（直接使用数据模型的列数组），keep_view为True时保留滚动位置与选中行"""
+        self.tree.set_column_data([self.model.column(name) for name in ("cast", "charge", "machine", "start", "end")],
+                                  keep_view=keep_view)
+
+    # ----------------- 交互事件处理 -----------------
+    def on_table_select(self, event):
+        """表格选中事件"""
+        selected = self.tree.selection()
+        if not selected:
+            return
+
+        item_index = selected[0]
+        self.model.toggle_highlight(item_index)  # 切换高亮状态
+
+        self.update_highlight()
+        self.tree.refresh()
+
+    # ----------------- 事件处理函数 -----------------
+    def on_press(self, event):
+        """鼠标按下事件"""
+        if event.inaxes != self.ax:
+            return
+        # 双击右键恢复原始视图
+        if event.button == 3 and event.dblclick:
+            self.ax.set_xlim(self.xlim)
+            self.render_gantt_view()
+            return
+        if event.button == 1 and self.start_drag(event):  # 左键按在任务块上：拖动编辑
+            return
+        if event.button == 1:  # 左键按下
+            self.press_start = (event.xdata, event.ydata)
+            self.zoom_rect = Rectangle((event.xdata, self.ax.get_ylim()[0]), 0, 0,
+                                       linestyle='--',
+                                       edgecolor='gray',
+                                       facecolor=(0.8, 0.8, 0.8, 0.5),
+                                       animated=True)
+            self.ax.add_patch(self.zoom_rect)
+            # 完整绘制一次并缓存背景，拖动过程中只重绘选框
+            self.canvas.draw()
+            self.zoom_background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+    def on_motion(self, event):
+        """鼠标拖动事件"""
+        if self.drag is not None:
+            self.drag_block(event)
+            return
+        if self.zoom_rect is None or event.inaxes != self.ax:
+            return
+        # 更新矩形框位置（垂直方向铺满）
+        start_x = self.press_start[0]
+        ymin, ymax = self.ax.get_ylim()
+        self.zoom_rect.set_xy((start_x, ymin))
+        self.zoom_rect.set_width(event.xdata - start_x)
+        self.zoom_rect.set_height(ymax - ymin)
+
+        # 恢复缓存背景后只绘制选框
+        self.canvas.restore_region(self.zoom_background)
+        self.ax.draw_artist(self.zoom_rect)
+        self.canvas.blit(self.ax.bbox)
+
+    def on_release(self, event):
+        """鼠标释放事件"""
+        if self.drag is not None:
+            self.finish_drag()
+            return
+        if self.zoom_rect is None:
+            return
+
+        # 获取缩放范围
+        start_x = self.press_start[0]
+        end_x = event.xdata if event.inaxes == self.ax else None
+
+        # 清理临时图形
+        self.zoom_rect.remove()
+        self.zoom_rect = None
+        self.zoom_background = None
+        self.press_start = None
+
+        # 调整坐标轴范围（忽略单击与轴外释放），并按新范围重新选取任务块
+        if end_x is not None and end_x != start_x:
+            self.ax.set_xlim(sorted([start_x, end_x]))
+            self.render_gantt_view()
+        else:
+            self.canvas.draw_idle()
+
+    # ----------------- 拖动编辑 -----------------
+    def start_drag(self, event):
+        """按下位置在明细模式的任务块上时开始拖动，返回是否开始"""
+        if self.block_collection is None or not len(self.visible_blocks):
+            return False
+        hit, info = self.block_collection.contains(event)
+        if not hit:
+            return False
+
+        index = int(self.visible_blocks[info["ind"][-1]])
+        self.drag = {
+            "index": index,
+            "dx": event.xdata - self.model.starts[index],
+            "machine": int(self.model.column("machine")[index]),
+            "changes": {},
+        }
+        # 拖动过程中只重绘任务块集合
+        self.block_collection.set_animated(True)
+        self.canvas.draw()
+        self.drag["background"] = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.drag_block(event)
+        return True
+
+    def drag_block(self, event):
+        """按鼠标位置预览移动结果：顺延的后继任务块以橙色边框标出"""
+        if event.inaxes != self.ax or event.xdata is None:
+            return
+        drag = self.drag
+        graph = self._get_propagation()
+        index = drag["index"]
+
+        # 纵向拖到同一阶段的其他设备
+        row = int(round(event.ydata))
+        machine = int(self.model.column("machine")[index])
+        if 1 <= row <= len(self.model.machines):
+            target = int(self.model.machines[row - 1])
+            if graph.can_move_to(index, target):
+                machine = target
+        try:
+            changes = graph.propagate(index, event.xdata - drag["dx"], machine)
+        except ValueError:
+            return
+        drag["machine"], drag["changes"] = machine, changes
+
+        visible = self.visible_blocks
+        starts = self.model.starts[visible].copy()
+        ends = self.model.ends[visible].copy()
+        rows = self.model.machine_row[visible].astype(float)
+        moved = np.zeros(len(visible), dtype=bool)
+        for i, (start, end) in changes.items():
+            position = np.searchsorted(visible, i)
+            if position < len(visible) and visible[position] == i:
+                starts[position], ends[position] = start, end
+                moved[position] = True
+        rows[np.searchsorted(visible, index)] = np.searchsorted(self.model.machines, machine) + 1
+
+        self.block_collection.set_verts(gantt_block_verts(starts, ends, rows))
+        edgecolors, marked = self._edge_style(visible)
+        edgecolors[moved] = to_rgba('orange')
+        self.block_collection.set_edgecolors(edgecolors)
+        self.block_collection.set_linewidths(np.where(moved | marked, 2, 0.5))
+
+        self.canvas.restore_region(drag["background"])
+        self.ax.draw_artist(self.block_collection)
+        self.canvas.blit(self.ax.bbox)
+
+    def finish_drag(self):
+        """写回拖动结果，只更新图形数据而不重建甘特图"""
+        drag, self.drag = self.drag, None
+        self.block_collection.set_animated(False)
+        changes = drag["changes"]
+        index = drag["index"]
+        unchanged = (len(changes) == 1 and changes[index][0] == self.model.starts[index]
+                     and drag["machine"] == self.model.column("machine")[index])
+        if not changes or unchanged:
+            self.render_gantt_view()
+            return
+
+        machines = self.model.machines
+        self._get_propagation().commit(index, changes, drag["machine"])
+        if not np.array_equal(machines, self.model.machines):
+            # 设备集合变化（某设备上的任务块全部移走）时行号改变，需要重建
+            self.update_gantt()
+        else:
+            self.render_gantt_view()
+        self.update_table(keep_view=True)  # 任务块顺序不变，只有时间与设备变化
+        self.kpi_panel.show(self.model, self._load_instance)
+        self.status_bar.status_var.set(f"已移动任务块，顺延后继任务块{len(changes) - 1}个")
+
+
+def gantt_block_verts(starts, ends, rows, height=0.9):
+    """根据开始/结束时间与行号批量生成甘特图矩形顶点，形状为(n, 4, 2)"""
+    half = height / 2
+    verts = np.empty((len(starts), 4, 2))
+    verts[:, 0, 0] = verts[:, 1, 0] = starts
+    verts[:, 2, 0] = verts[:, 3, 0] = ends
+    verts[:, 0, 1] = verts[:, 3, 1] = rows - half
+    verts[:, 1, 1] = verts[:, 2, 1] = rows + half
+    return verts
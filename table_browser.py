@@ -0,0 +1,158 @@
+# table_browser.py
+import sqlite3
+
+PAGE_SIZE = 500     # 每页行数
+FTS_MIN_LENGTH = 3  # trigram全文索引要求的最短关键字长度
+
+# 筛选与排序使用的索引：表名 -> [(索引名, 列)]
+TABLE_INDEXES = {
+    "cast_plan": [
+        ("idx_cast_plan_order_no", "order_no"),
+        ("idx_cast_plan_cast_charge", "cast_no, charge_no"),
+    ],
+    "production": [
+        ("idx_production_order_no", "order_no"),
+    ],
+}
+
+# 全文检索（子串匹配）的字段：合同号与炉号
+FTS_COLUMNS = {
+    "cast_plan": ("heat_id", "order_no"),
+    "production": ("order_no", "furnace_no"),
+}
+
+
+def ensure_indexes(db):
+    """建立筛选索引与FTS5全文索引，返回建立了全文索引的表名集合
+
+    全文索引使用外部内容表与触发器保持同步，首次建立时从原表重建。
+    SQLite不支持FTS5或trigram分词时跳过，检索退回LIKE。
+    """
+    with db.transaction() as conn:
+        for table, indexes in TABLE_INDEXES.items():
+            for name, columns in indexes:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+
+    fts_tables = set()
+    for table, columns in FTS_COLUMNS.items():
+        fts = f"{table}_fts"
+        if db.query_one("SELECT 1 FROM sqlite_master WHERE name=?", (fts,)):
+            fts_tables.add(table)
+            continue
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{c}" for c in columns)
+        old_values = ", ".join(f"old.{c}" for c in columns)
+        try:
+            with db.transaction() as conn:
+                conn.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({column_list}, "
+                             f"content='{table}', content_rowid='rowid', tokenize='trigram')")
+                conn.execute(f"""CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN
+                                 INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+                                 END""")
+                conn.execute(f"""CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN
+                                 INSERT INTO {fts}({fts}, rowid, {column_list})
+                                 VALUES ('delete', old.rowid, {old_values});
+                                 END""")
+                conn.execute(f"""CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN
+                                 INSERT INTO {fts}({fts}, rowid, {column_list})
+                                 VALUES ('delete', old.rowid, {old_values});
+                                 INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+                                 END""")
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            fts_tables.add(table)
+        except sqlite3.OperationalError:
+            pass
+    return fts_tables
+
+
+class TableBrowser:
+    """数据库表的分页浏览
+
+    按(排序列, rowid)做键集分页：每页从上一页最后一行的键之后开始取，
+    不使用OFFSET，翻到第几页查询代价都相同。索引条目自带rowid，
+    按有索引的列排序时不需要额外排序。排序与筛选都在SQL中完成：
+    指定列时按前缀筛选（可使用该列上的索引），不指定列时在全文索引中做子串检索。
+    """
+
+    def __init__(self, db, table, page_size=PAGE_SIZE, fts=False):
+        self.db = db
+        self.table = table
+        self.page_size = page_size
+        self.columns = db.columns(table)
+        self.key = "rowid"  # 分页键的第二列，保证排序唯一
+        self.fts = fts  # 是否有{table}_fts全文索引
+        self.sort_column = db.primary_key(table)
+        self.descending = False
+        self.filter_column = None  # None表示全文检索
+        self.keyword = ""
+
+    def set_sort(self, column, descending=False):
+        self.sort_column = column
+        self.descending = descending
+
+    def set_filter(self, column, keyword):
+        self.filter_column = column
+        self.keyword = keyword.strip()
+
+    def fetch_page(self, after=None):
+        """读取after之后的一页，返回(行列表, 本页最后一行的键, 是否还有下一页)
+
+        after为上一页返回的键，None表示第一页。
+        """
+        conditions, params = self._filter_clause()
+        if after is not None:
+            clause, values = self._keyset_clause(after)
+            conditions.append(clause)
+            params.extend(values)
+
+        direction = "DESC" if self.descending else "ASC"
+        order = f"{self.key} {direction}"
+        if self.sort_column != self.key:
+            order = f"{self.sort_column} {direction}, {order}"
+        sql = f"SELECT {self.key}, {self.sort_column}, * FROM {self.table}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(self.page_size + 1)
+
+        rows = self.db.query(sql, params)
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        last = (rows[-1][1], rows[-1][0]) if rows else after
+        return [row[2:] for row in rows], last, has_more
+
+    def _filter_clause(self):
+        if not self.keyword:
+            return [], []
+        if self.filter_column is not None:
+            # GLOB前缀匹配区分大小写，可使用列上的BINARY索引
+            return [f"{self.filter_column} GLOB ?"], [_glob_escape(self.keyword) + "*"]
+        if self.fts and len(self.keyword) >= FTS_MIN_LENGTH:
+            phrase = '"' + self.keyword.replace('"', '""') + '"'
+            return [f"rowid IN (SELECT rowid FROM {self.table}_fts WHERE {self.table}_fts MATCH ?)"], [phrase]
+
+        # 关键字过短或没有全文索引时退回LIKE
+        columns = FTS_COLUMNS.get(self.table, self.columns)
+        pattern = "%" + self.keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        clause = " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in columns)
+        return [f"({clause})"], [pattern] * len(columns)
+
+    def _keyset_clause(self, after):
+        """位于键after之后的行（升序时NULL排在最前，降序时排在最后）"""
+        value, key = after
+        op = "<" if self.descending else ">"
+        column = self.sort_column
+        if column == self.key:
+            return f"{self.key} {op} ?", [key]
+        if value is None:
+            if self.descending:
+                return f"({column} IS NULL AND {self.key} < ?)", [key]
+            return f"({column} IS NOT NULL OR {self.key} > ?)", [key]
+        clause = f"(({column}, {self.key}) {op} (?, ?))"
+        if self.descending:
+            clause = f"({clause} OR {column} IS NULL)"
+        return clause, [value, key]
+
+
+def _glob_escape(text):
+    return "".join(f"[{c}]" if c in "*?[" else c for c in text)
@@ -1,36 +1,53 @@
 # main.py
-import signal
+import time
+
+STARTED = time.perf_counter()  # 启动计时起点（在其余导入之前）
+
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox
 import json
-import subprocess
 import os
-from xml.dom import minidom
-from xml.sax import parseString
-
-import matplotlib
-import numpy as np
-from matplotlib import pyplot as plt
-import xml.etree.ElementTree as ET
-from tkinter import ttk
+import sys
 import sqlite3
-from tkinter import simpledialog
 
-matplotlib.use('TkAgg')
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-from matplotlib.patches import Rectangle
+import contract_store
+import data_access
+import file_watcher
+from cast_plan import CastPlan, export_cast_plan
+from edit_journal import JsonBlockJournal, XmlRecordJournal
+from gui_common import SolverStatusBar, StartupProfile, after_future
+from table_browser import TableBrowser, ensure_indexes
+from solver_runner import SolverRunner
+from virtual_table import VirtualTable
+
+CAST_PLAN_XML = "castInput.xml"  # 组炉程序输出的浇次计划
+# 输入数据表格展示的字段（与input_tree列顺序一致）
+INPUT_FIELDS = (
+    "FURNACE_NO", "SLAB_NUM", "FURNACE_WT",
+    "FURNACE_AVAILABLE_CC_LIST", "FURNACE_WIDTH_MAX", "FURNACE_WIDTH_MIN"
+)
+
 
 class FurnacePlanningModule(tk.Frame):
     """组炉组浇模块"""
     def __init__(self, parent):
         super().__init__(parent)
         self.configure(bg="#E8F5E9")
-        self.process = None
+        self.runner = None  # 组炉程序运行器
+        self.db = data_access.shared()
+        self._input_token = 0  # 输入数据加载序号，丢弃过期的查询结果
+        self.cast_plan = None
+        self.cast_pending = {}  # 未展开的树节点 -> (浇次下标, 炉次下标或None)
         self.create_widgets()
         self.load_settings()
         self.load_input_data()
-        self.load_cast_results()
+        self.after_idle(self.load_cast_results)  # 界面显示后再解析浇次计划
+
+        # 组炉程序输出文件更新后自动刷新
+        watcher = file_watcher.shared()
+        # 与数据管理模块共用contract_store.sync，文件变化时只导入一次
+        watcher.watch(contract_store.CONTRACT_XML, contract_store.sync, lambda changed: self.load_input_data(), self)
+        watcher.watch(CAST_PLAN_XML, CastPlan.from_xml, self._show_cast_results, self)
 
     def create_widgets(self):
         """创建三大子模块"""
@@ -71,30 +88,16 @@ class FurnacePlanningModule(tk.Frame):
         ttk.Button(btn_frame, text="中止运行", command=self.stop_furnace_plan).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="导出到数据库", command=self.export_cast_plan).pack(side="left", padx=5)
 
+        # 运行进度
+        self.status_bar = SolverStatusBar(parent)
+        self.status_bar.pack(fill="x", padx=5, pady=2)
+
     def export_cast_plan(self):
-        """导出浇次计划到数据库"""
+        """导出浇次计划到数据库（流式解析，单事务批量写入）"""
         try:
-            dom = minidom.parse("castInput.xml")
-            conn = sqlite3.connect('steel_production.db')
-            cursor = conn.cursor()
-
-            for cast in dom.getElementsByTagName("Cast"):
-                cast_no = cast.getAttribute("chargeNum")
-                for charge in cast.getElementsByTagName("Charge"):
-                    charge_no = charge.getAttribute("lgSt")
-                    for heat in charge.getElementsByTagName("Heat"):
-                        data = (
-                            heat.getAttribute("chargeNo"),  # heat_id
-                            cast_no,
-                            charge_no,
-                            heat.getAttribute("orderNo"),
-                            heat.getAttribute("minLength"),
-                            heat.getAttribute("maxLength")
-                        )
-                        cursor.execute('''INSERT OR REPLACE INTO cast_plan 
-                                        VALUES (?,?,?,?,?,?)''', data)
-            conn.commit()
-            messagebox.showinfo("成功", f"导出{cast_no}条浇次计划数据")
+            stats = export_cast_plan(CAST_PLAN_XML, data_access.shared())
+            messagebox.showinfo("成功", f"导出浇次{stats['casts']}个、炉次{stats['charges']}个，"
+                                      f"共{stats['heats']}条钢水，写入{stats['rows']}条浇次计划数据")
         except Exception as e:
             messagebox.showerror("错误", f"导出失败: {str(e)}")
 
@@ -124,45 +127,39 @@ class FurnacePlanningModule(tk.Frame):
 
     # ----------------- 程序控制 -----------------
     def run_furnace_plan(self):
-        """运行组炉程序"""
-        if self.process and self.process.poll() is None:
+        """运行组炉程序（后台采集输出与日志进度）"""
+        if self.runner and self.runner.running:
             messagebox.showwarning("警告", "程序已在运行中")
             return
 
         try:
-            self.process = subprocess.Popen("furnacePlan.exe", shell=True)
+            # 外部程序直接读写XML文件，先合并界面上的编辑
+            XmlRecordJournal(contract_store.CONTRACT_XML).compact()
+            self.runner = SolverRunner([os.path.abspath("furnacePlan.exe")], log_path="outTestLog.txt").start()
+            self.status_bar.attach(self.runner)
         except Exception as e:
             messagebox.showerror("错误", f"程序启动失败: {str(e)}")
 
     def stop_furnace_plan(self):
         """中止程序运行"""
-        if self.process is None or self.process.poll() is not None:
+        if self.runner is None or not self.runner.running:
             messagebox.showinfo("提示", "没有正在运行的程序")
             return
 
         try:
-            if os.name == 'nt':
-                subprocess.run(f"taskkill /F /T /PID {self.process.pid}", shell=True)
-            else:
-                os.kill(self.process.pid, signal.SIGTERM)
+            self.runner.stop()
             messagebox.showinfo("成功", "程序已中止")
-            self.process = None
         except Exception as e:
             messagebox.showerror("错误", f"中止失败: {str(e)}")
 
     # ----------------- 输入数据展示模块 -----------------
     def create_input_display(self, parent):
         """创建表格形式的XML数据展示"""
-        # 创建带滚动条的Treeview
-        self.input_tree = ttk.Treeview(parent, columns=(
+        # 创建带滚动条的虚拟表格（只为可视行创建Tk条目）
+        self.input_tree = VirtualTable(parent, columns=(
             "furnace_no", "slab_num", "weight",
             "cc_list", "width_max", "width_min"
-        ), show="headings")
-
-        # 配置滚动条
-        vsb = ttk.Scrollbar(parent, orient="vertical", command=self.input_tree.yview)
-        hsb = ttk.Scrollbar(parent, orient="horizontal", command=self.input_tree.xview)
-        self.input_tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        ), stripe_tags=("evenrow", "oddrow"))
 
         # 配置列定义
         columns = {
@@ -185,45 +182,31 @@ class FurnacePlanningModule(tk.Frame):
 
         # 布局
         self.input_tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
-        hsb.grid(row=1, column=0, sticky="ew")
 
         # 设置网格行列权重
         parent.grid_rowconfigure(0, weight=1)
         parent.grid_columnconfigure(0, weight=1)
 
     def load_input_data(self):
-        """加载并展示FurnaceResult数据"""
-        try:
-            # 清空现有数据
-            for item in self.input_tree.get_children():
-                self.input_tree.delete(item)
-
-            tree = ET.parse("FurnaceResult2.xml")
-
-            # 遍历每个FurnaceResult
-            for idx, result in enumerate(tree.findall(".//FurnaceResult")):
-                # 提取数据
-                values = (
-                    self._get_text(result, "FURNACE_NO"),
-                    self._get_text(result, "SLAB_NUM"),
-                    self._get_text(result, "FURNACE_WT"),
-                    self._get_text(result, "FURNACE_AVAILABLE_CC_LIST"),
-                    self._get_text(result, "FURNACE_WIDTH_MAX"),
-                    self._get_text(result, "FURNACE_WIDTH_MIN")
-                )
-
-                # 插入表格并设置交替颜色
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.input_tree.insert("", "end", values=values, tags=(tag,))
-
-        except Exception as e:
-            messagebox.showerror("错误", f"加载XML数据失败: {str(e)}")
-
-    def _get_text(self, element, tag):
-        """安全获取XML节点文本"""
-        node = element.find(tag)
-        return node.text if node is not None else "N/A"
+        """加载并展示FurnaceResult数据
+
+        合同XML变化时先导入数据库，之后从contract表查询，查询在后台线程执行。
+        """
+        self._input_token += 1
+        token = self._input_token
+        after_future(self, self.db.submit(self._read_input), lambda rows: self._show_input(token, rows),
+                     lambda e: messagebox.showerror("错误", f"加载XML数据失败: {str(e)}"))
+
+    def _read_input(self, path=contract_store.CONTRACT_XML):
+        """导入合同XML的变化并查询输入数据（在后台线程执行）"""
+        contract_store.sync(path, self.db)
+        return contract_store.query(self.db, INPUT_FIELDS, missing="N/A")
+
+    def _show_input(self, token, rows):
+        if token != self._input_token:
+            return
+        # 交替行颜色由表格按行号设置
+        self.input_tree.set_rows(rows)
 
     # ----------------- 结果展示模块 -----------------
     def create_result_table(self, parent):
@@ -239,352 +222,56 @@ class FurnacePlanningModule(tk.Frame):
         self.cast_tree.tag_configure("cast", background="#B0E0E6")
         self.cast_tree.tag_configure("charge", background="#98FB98")
         self.cast_tree.tag_configure("heat", background="white")
+        # 子节点在展开时才插入
+        self.cast_tree.bind("<<TreeviewOpen>>", self.on_cast_open)
 
         self.cast_tree.pack(side="left", fill="both", expand=True)
         vsb.pack(side="right", fill="y")
         hsb.pack(side="bottom", fill="x")
 
     def load_cast_results(self):
-        """加载浇注计划结果"""
-        try:
-            tree = ET.parse("castInput.xml")
-            root = tree.getroot()
-
-            # 清空现有数据
-            for item in self.cast_tree.get_children():
-                self.cast_tree.delete(item)
-
-            # 添加层次数据
-            for cast in root.findall("Cast"):
-                cast_id = self.cast_tree.insert("", "end",
-                                                text=f"浇次 (炉数: {cast.attrib['chargeNum']})",
-                                                tags=("cast",))
-
-                for charge in cast.findall("Charge"):
-                    charge_id = self.cast_tree.insert(cast_id, "end",
-                                                      text=f"炉次 (实际长度: {charge.attrib['realLength']}mm)",
-                                                      tags=("charge",))
-
-                    for heat in charge.findall("Heat"):
-                        self.cast_tree.insert(charge_id, "end",
-                                              text=f"钢水 | 订单号: {heat.attrib['orderNo']} "
-                                                   f"长度范围: {heat.attrib['minLength']}-{heat.attrib['maxLength']}mm",
-                                              tags=("heat",))
-        except Exception as e:
-            messagebox.showerror("错误", f"加载浇注计划失败: {str(e)}")
-
-class SteelCastingModule(tk.Frame):
-    """炼钢连铸模块"""
-
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.configure(background="#E8F5E9")
-        self.process = None
-        self.highlight_items = set()  # 存储高亮项的ID
-        # 正确初始化顺序
-        self.create_widgets()      # 先创建子控件
-        self.setup_gantt_interaction()  # 再设置交互
-        self.load_settings()
-        self.load_result()
-        self.process = None
-
-    def setup_gantt_interaction(self):
-        """设置图表交互事件"""
-        # 绑定到 matplotlib canvas
-        self.canvas.mpl_connect("button_press_event", self.on_press)
-        self.canvas.mpl_connect("motion_notify_event", self.on_motion)
-        self.canvas.mpl_connect("button_release_event", self.on_release)
-
-        # 初始化交互状态
-        self.zoom_rect = None
-        self.press_start = None
-        self.xlim = self.ax.get_xlim()
-
-    def create_widgets(self):
-        """创建三个子模块"""
-        # 参数配置模块
-        param_frame = ttk.LabelFrame(self, text="参数配置与程序启动")
-        param_frame.pack(fill="x", padx=10, pady=5)
-        self.create_param_controls(param_frame)
-
-        # 甘特图模块
-        self.gantt_frame = ttk.LabelFrame(self, text="生产计划甘特图")
-        self.gantt_frame.pack(fill="both", expand=True, padx=10, pady=5)
-        self.create_gantt_chart()
-
-        # 数据表格模块
-        table_frame = ttk.LabelFrame(self, text="生产数据明细")
-        table_frame.pack(fill="both", padx=10, pady=5)
-        self.create_data_table(table_frame)
-
-    def create_param_controls(self, parent):
-        """参数输入控件"""
-        params = ["Start", "End", "Diff", "time_limit"]
-        self.entries = {}
-
-        for i, param in enumerate(params):
-            row = ttk.Frame(parent)
-            row.pack(fill="x", padx=5, pady=2)
-
-            ttk.Label(row, text=param + ":", width=12).pack(side="left")
-            entry = ttk.Entry(row, width=10)
-            entry.pack(side="left", padx=5)
-            self.entries[param] = entry
-
-        # 按钮组
-        btn_frame = ttk.Frame(parent)
-        btn_frame.pack(pady=5)
-        ttk.Button(btn_frame, text="保存配置", command=self.save_settings).pack(side="left", padx=5)
-        ttk.Button(btn_frame, text="执行程序", command=self.run_program).pack(side="left", padx=5)
-        ttk.Button(btn_frame, text="中止执行", command=self.stop_program).pack(side="left", padx=5)
-
-    def create_gantt_chart(self):
-        """创建甘特图画布"""
-        self.fig = Figure(figsize=(8, 4), dpi=100)
-        self.ax = self.fig.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.gantt_frame)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
-
-    def create_data_table(self, parent):
-        """创建数据表格"""
-        self.tree = ttk.Treeview(parent, columns=("cast", "charge", "machine", "start", "end"), show="headings")
-        vsb = ttk.Scrollbar(parent, orient="vertical", command=self.tree.yview)
-        hsb = ttk.Scrollbar(parent, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-
-        self.tree.pack(side="left", fill="both", expand=True)
-        vsb.pack(side="right", fill="y")
-        hsb.pack(side="bottom", fill="x")
-
-        # 配置表头
-        columns = {
-            "cast": "浇次号",
-            "charge": "炉次号",
-            "machine": "设备号",
-            "start": "开始时间",
-            "end": "结束时间"
-        }
-        for col, text in columns.items():
-            self.tree.heading(col, text=text)
-            self.tree.column(col, width=80, anchor="center")
-
-        # 绑定点击事件
-        self.tree.bind("<<TreeviewSelect>>", self.on_table_select)
-
-    # ----------------- 数据操作相关方法 -----------------
-    def load_settings(self):
-        """加载配置文件"""
-        try:
-            with open("Data/setting.json") as f:
-                self.settings = json.load(f)
-                for key, entry in self.entries.items():
-                    entry.delete(0, tk.END)
-                    entry.insert(0, str(self.settings.get(key, "")))
-        except Exception as e:
-            messagebox.showerror("错误", f"无法读取配置文件:\n{str(e)}")
-
-    def save_settings(self):
-        """保存配置文件"""
-        try:
-            for key, entry in self.entries.items():
-                self.settings[key] = int(entry.get())
-
-            with open("Data/setting.json", "w") as f:
-                json.dump(self.settings, f, indent=4)
-
-            messagebox.showinfo("成功", "配置保存成功")
-        except Exception as e:
-            messagebox.showerror("错误", f"保存失败:\n{str(e)}")
-
-    def load_result(self):
-        """加载结果数据"""
-        try:
-            with open("Data/SCC_RES/result.json") as f:
-                data = json.load(f)
-                self.result_data = data.get("block", [])
-                self.start_time = data.get("start_time", 0)
-
-                # 添加高亮状态
-                for item in self.result_data:
-                    item["highlight"] = False
-
-                self.update_gantt()
-                self.update_table()
-        except Exception as e:
-            messagebox.showerror("错误", f"无法读取结果文件:\n{str(e)}")
-
-    # ----------------- 程序执行控制 -----------------
-    def run_program(self):
-        """执行主程序"""
-        if self.process and self.process.poll() is None:
-            messagebox.showwarning("警告", "程序已在运行中")
-            return
-
-        try:
-            self.process = subprocess.Popen("main.exe", shell=True)
-        except Exception as e:
-            messagebox.showerror("错误", f"程序启动失败:\n{str(e)}")
-
-    def stop_program(self):
-        if self.process is None or self.process.poll() is not None:
-            messagebox.showinfo("提示", "没有正在运行的程序")
-            return
-
-        try:
-            if os.name == 'nt':
-                # 终止进程树
-                subprocess.run(
-                    f"taskkill /F /T /PID {self.process.pid}",
-                    shell=True,
-                    check=True
-                )
-            else:
-                os.kill(self.process.pid, signal.SIGTERM)
-
-            # 等待进程终止，避免状态误判
-            self.process.wait(timeout=5)
-            messagebox.showinfo("提示", "程序已中止")
-            self.process = None
-
-        except subprocess.TimeoutExpired:
-            messagebox.showerror("错误", "中止失败：进程未在指定时间内终止")
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("错误", f"中止失败（命令执行错误）:\n{str(e)}")
-        except Exception as e:
-            messagebox.showerror("错误", f"中止失败:\n{str(e)}")
-
-    # ----------------- 可视化更新方法 -----------------
-    def update_gantt(self):
-        plt.rcParams['font.sans-serif'] = ['Microsoft YaHei']  # 使用微软雅黑
-        plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
-        """更新甘特图"""
-        self.ax.clear()
-
-        # 获取机器列表
-        machines = sorted({item["machine"] for item in self.result_data})
-        y_ticks = [i + 1 for i in range(len(machines))]
-        self.ax.set_yticks(y_ticks)
-        self.ax.set_yticklabels([f"设备 {m}" for m in machines])
-        # 计算时间范围
-        xmin = min(item["start"] - self.start_time for item in self.result_data)
-        xmax = max(item["end"] - self.start_time for item in self.result_data)
-
-        # 设置坐标轴范围
-        self.ax.set_ylim(0.5, len(machines) + 0.5)  # 增加垂直缩进
-        self.ax.set_xlim(xmin - 50, xmax + 50)  # 增加水平缩进
-        # 设置刻度步长（关键修改）
-        self.ax.set_xticks(np.arange(xmin // 100 * 100, xmax + 100, 100))  # 100单位间隔
-        # 设置颜色映射
-        charges = list(set(item["charge"] for item in self.result_data))
-        colors = matplotlib.cm.get_cmap('tab20', len(charges))
-        color_map = {charge: colors(i) for i, charge in enumerate(charges)}
-
-        # 绘制每个任务块
-        for item in self.result_data:
-            machine_idx = machines.index(item["machine"]) + 1
-            start = item["start"] - self.start_time
-            duration = item["end"] - item["start"]
-            # 根据高亮状态设置颜色
-
-            rect = Rectangle(
-                (start, machine_idx - 0.45),  # y位置微调
-                duration,
-                0.9,  # 高度从0.8增大到0.9
-                facecolor=color_map[item["charge"]],
-                edgecolor='red' if item["highlight"] else 'black',
-                linewidth=2 if item["highlight"] else 0.5
-            )
-            self.ax.add_patch(rect)
-        # 设置图表样式
-        self.ax.set_xlabel("时间（分钟）")
-        self.ax.grid(True, axis='x', linestyle='--')
-        self.fig.tight_layout()
-        # self.canvas.draw()
-
-    def update_table(self):
-        """更新数据表格"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        for item in self.result_data:
-            values = (
-                item["cast"],
-                item["charge"],
-                item["machine"],
-                item["start"],
-                item["end"]
-            )
-            self.tree.insert("", "end", values=values, tags=("highlight" if item["highlight"] else ""))
-
-    # ----------------- 交互事件处理 -----------------
-    def on_table_select(self, event):
-        """表格选中事件"""
-        selected = self.tree.selection()
-        if not selected:
-            return
-
-        item_id = selected[0]
-        item_index = self.tree.index(item_id)
-        self.result_data[item_index]["highlight"] ^= True  # 切换高亮状态
-
-        self.update_gantt()
-        self.update_table()
-
-    # ----------------- 事件处理函数 -----------------
-    def on_press(self, event):
-        """鼠标按下事件"""
-        if event.inaxes != self.ax:
-            return
-        if event.button == 1:  # 左键按下
-            self.press_start = (event.xdata, event.ydata)
-            self.zoom_rect = Rectangle((0, 0), 0, 0,
-                                       linestyle='--',
-                                       edgecolor='gray',
-                                       facecolor=(0.8, 0.8, 0.8, 0.5))
-            self.ax.add_patch(self.zoom_rect)
-            self.canvas.draw()
-
-    def on_motion(self, event):
-        """鼠标拖动事件"""
-        if self.zoom_rect is None or event.inaxes != self.ax:
-            return
-        # 更新矩形框位置
-        start_x, start_y = self.press_start
-        curr_x = event.xdata
-        curr_y = event.ydata
-
-        width = curr_x - start_x
-        height = curr_y - start_y
-
-        self.zoom_rect.set_width(width)
-        self.zoom_rect.set_height(height * 10)  # 垂直方向铺满
-        self.zoom_rect.set_xy((start_x, self.ax.get_ylim()[0]))
-        self.canvas.draw()
-
-    def on_release(self, event):
-        """鼠标释放事件"""
-        if self.zoom_rect is None:
+        """加载浇注计划结果（解析在后台线程执行）"""
+        after_future(self, self.db.submit(CastPlan.from_xml, CAST_PLAN_XML), self._show_cast_results,
+                     lambda e: messagebox.showerror("错误", f"加载浇注计划失败: {str(e)}"))
+
+    def _show_cast_results(self, plan):
+        """只插入浇次节点，炉次与钢水在展开时插入"""
+        self.cast_plan = plan
+        self.cast_pending = {}
+        self.cast_tree.delete(*self.cast_tree.get_children())
+
+        for i in range(len(plan)):
+            cast_id = self.cast_tree.insert(
+                "", "end", tags=("cast",),
+                text=f"浇次 (炉数: {plan.charge_num[i]}, 钢水数: {plan.heat_count[i]}, "
+                     f"总长度: {plan.real_length[i]}mm)")
+            self._add_placeholder(cast_id, (i, None))
+
+    def _add_placeholder(self, item, position):
+        """插入一个空子节点使节点可展开"""
+        self.cast_tree.insert(item, "end")
+        self.cast_pending[item] = position
+
+    def on_cast_open(self, event):
+        """展开浇次或炉次时插入其子节点（只在第一次展开时）"""
+        item = self.cast_tree.focus()
+        position = self.cast_pending.pop(item, None)
+        if position is None:
             return
+        self.cast_tree.delete(*self.cast_tree.get_children(item))
+        cast, charge = position
+        plan = self.cast_plan
+        if charge is None:
+            for j, (_, real_length, group) in enumerate(plan.charges[cast]):
+                charge_id = self.cast_tree.insert(item, "end", tags=("charge",),
+                                                  text=f"炉次 (实际长度: {real_length}mm)")
+                if plan.heat_groups[group]:
+                    self._add_placeholder(charge_id, (cast, j))
+        else:
+            for order_no, _, min_length, max_length in plan.charge_heats(cast, charge):
+                self.cast_tree.insert(item, "end", tags=("heat",),
+                                      text=f"钢水 | 订单号: {order_no} 长度范围: {min_length}-{max_length}mm")
 
-        # 获取缩放范围
-        start_x = self.press_start[0]
-        end_x = event.xdata
-
-        # 调整坐标轴范围
-        self.ax.set_xlim(sorted([start_x, end_x]))
-
-        # 清理临时图形
-        self.zoom_rect.remove()
-        self.zoom_rect = None
-        self.press_start = None
-
-        # 重绘图表
-        self.canvas.draw()
-
-        # 双击右键恢复原始视图
-        if event.button == 3 and event.dblclick:
-            self.ax.set_xlim(self.xlim)
-            self.canvas.draw()
 
 class DataManagementModule(tk.Frame):
     """数据管理模块"""
@@ -610,26 +297,34 @@ class DataManagementModule(tk.Frame):
             self.destroy()
     def __init__(self, parent):
         super().__init__(parent)
-        # 新增数据库连接
-        self.db_conn = sqlite3.connect(
-            'steel_production.db',
-            check_same_thread=False
-        )
-        print("数据库绝对路径:", os.path.abspath("steel_production.db"))
-        # 添加SQL日志追踪（关键调试代码）
+        # 共享的数据库访问层（连接池，慢查询计时）
+        self.db = data_access.shared()
+        self.load_token = 0  # 后台加载序号，丢弃过期的加载结果
+        self.browser = None  # 当前数据库表的分页浏览器
+        self.page_starts = [None]  # 已浏览各页的起始键，用于返回上一页
+        self.page_last = None  # 当前页最后一行的键
+        self.page_has_more = False
+        self.fts_tables = set()  # 已建立全文索引的表
         self.table_var = tk.StringVar()
         self.table_var.trace_add("write", self.on_table_changed)  # 添加状态监听
-        self.db_conn.set_trace_callback(print)
         self.current_table = "production"  # 当前显示表
         self.table_config = {
             "production": {"type": "db", "title": "生产数据表"},
             "cast_plan": {"type": "db", "title": "浇次计划结果表"},
-            "contract": {"type": "xml", "file": "FurnaceResult2.xml"},
+            "contract": {"type": "xml", "file": contract_store.CONTRACT_XML},
             "steel_result": {"type": "json", "file": "Data/result.json"}
         }
         self.create_ui()
         self.init_tables()
 
+        # 文件被外部程序更新后，正在显示的表自动刷新
+        # 合同XML与组炉组浇模块共用contract_store.sync，变化时只导入一次
+        watcher = file_watcher.shared()
+        watcher.watch(contract_store.CONTRACT_XML, contract_store.sync,
+                      lambda changed: self._on_file_changed("contract", changed), self)
+        watcher.watch(self.table_config["steel_result"]["file"], self._read_file_table,
+                      lambda model: self._on_file_changed("steel_result", model), self)
+
     def on_table_changed(self, event=None):
         """当前表变化时更新数据和按钮状态"""
         # 获取最新选择值（关键！）
@@ -637,11 +332,6 @@ class DataManagementModule(tk.Frame):
         print(f"当前表已切换至：{self.current_table}")
         self.load_current_data()
 
-    def __del__(self):
-        """析构时关闭连接"""
-        if hasattr(self, 'db_conn'):
-            self.db_conn.close()
-
     def create_ui(self):
         """创建带表切换功能的界面"""
         control_frame = ttk.Frame(self)
@@ -664,26 +354,40 @@ class DataManagementModule(tk.Frame):
         ttk.Button(btn_frame, text="刷新", command=self.load_current_data).pack(side="left", padx=2)
         ttk.Button(btn_frame, text="添加", command=self.add_record).pack(side="left", padx=2)
         ttk.Button(btn_frame, text="删除", command=self.delete_record).pack(side="left", padx=2)
+        ttk.Button(btn_frame, text="合并编辑", command=self.compact_journals).pack(side="left", padx=2)
+
+        # 筛选与翻页（数据库表在SQL中排序、筛选与分页）
+        page_frame = ttk.Frame(self)
+        page_frame.pack(fill="x", pady=2)
+        self.filter_field = ttk.Combobox(page_frame, values=["全文"], state="readonly", width=12)
+        self.filter_field.set("全文")
+        self.filter_field.pack(side="left", padx=5)
+        self.search_entry = ttk.Entry(page_frame, width=20)
+        self.search_entry.pack(side="left", padx=2)
+        self.search_entry.bind("<Return>", lambda event: self.search_data())
+        ttk.Button(page_frame, text="筛选", command=self.search_data).pack(side="left", padx=2)
+        self.page_var = tk.StringVar()
+        ttk.Label(page_frame, textvariable=self.page_var).pack(side="right", padx=5)
+        ttk.Button(page_frame, text="下一页", command=self.next_page).pack(side="right", padx=2)
+        ttk.Button(page_frame, text="上一页", command=self.prev_page).pack(side="right", padx=2)
 
         # 数据表格
-        self.tree = ttk.Treeview(self, columns=(), show="headings")
-        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-
+        self.tree = VirtualTable(self)
         self.tree.pack(side="left", fill="both", expand=True)
-        vsb.pack(side="right", fill="y")
-        hsb.pack(side="bottom", fill="x")
 
     # ----------------- 通用数据操作 -----------------
     def load_current_data(self):
         """加载当前表数据"""
         table = self.table_var.get()
+        self.load_token += 1
         if self.table_config[table]["type"] == "db":
             self.load_db_table(table)
-        elif self.table_config[table]["type"] == "xml":
+            return
+        if self.table_config[table]["type"] == "xml":
             self.load_xml_data()
         elif self.table_config[table]["type"] == "json":
+            self.browser = None
+            self.page_var.set("")
             self.load_json_data()
 
         # ----------------- 数据库表操作 -----------------
@@ -699,77 +403,130 @@ class DataManagementModule(tk.Frame):
 
         if table_type == "db":
             self._delete_db_record(selected)
-        else:
-            messagebox.showerror("操作禁止", "非数据库表不允许直接修改，请通过文件操作更新数据")
-            return
+        elif table_type == "xml":
+            self._delete_xml_record(selected)
+        elif table_type == "json":
+            self._delete_json_record(selected)
     def _delete_db_record(self, selected_items):
-        """删除数据库记录"""
-        with sqlite3.connect('steel_production.db') as conn:
-            cursor = conn.cursor()
-            for item_id in selected_items:
-                # 获取记录唯一标识
-                item = self.tree.item(item_id)
-                record_id = item['values'][0]  # 假设ID在第一列
-
-                # 动态表名
-                cursor.execute(
-                    f"DELETE FROM {self.current_table} WHERE id=?",
-                    (record_id,)
-                )
-            conn.commit()
+        """删除数据库记录（按主键删除，主键在第一列）"""
+        key = self.db.primary_key(self.current_table)
+        self.db.executemany(
+            f"DELETE FROM {self.current_table} WHERE {key}=?",
+            [(self.tree.row(index)[0],) for index in selected_items]
+        )
         self.load_current_data()
 
     def load_db_table(self, table_name):
-        """加载数据库表"""
-        self.tree.delete(*self.tree.get_children())
-        with sqlite3.connect('steel_production.db') as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [col[1] for col in cursor.fetchall()]
+        """分页加载数据库表（查询在后台线程执行）
 
-            # 配置表格列
-            self.tree["columns"] = columns
-            for col in columns:
-                self.tree.heading(col, text=col)
-                self.tree.column(col, width=100)
+        刷新同一张表时保留排序、筛选条件与当前页。
+        """
+        if self.browser is not None and self.browser.table == table_name:
+            self._fetch_page(self.page_starts[-1])
+            return
 
-            # 加载数据
-            cursor.execute(f"SELECT * FROM {table_name}")
-            for row in cursor.fetchall():
-                self.tree.insert("", "end", values=row)
+        self.load_token += 1
+        token = self.load_token
 
-    # ----------------- XML表操作 -----------------
-    def load_xml_data(self):
-        """加载XML合同数据"""
-        self.tree.delete(*self.tree.get_children())
-        dom = minidom.parse("FurnaceResult2.xml")
-        records = dom.getElementsByTagName("FurnaceResult")
+        def open_table():
+            browser = TableBrowser(self.db, table_name, fts=table_name in self.fts_tables)
+            return browser, browser.fetch_page()
+
+        after_future(self, self.db.submit(open_table), lambda result: self._show_db_table(token, *result))
 
-        # 动态获取字段
-        sample = records[0] if records else []
-        columns = [node.tagName for node in sample.childNodes if node.nodeType == node.ELEMENT_NODE]
+    def _show_db_table(self, token, browser, page):
+        if token != self.load_token:
+            return  # 期间已切换到其他表
+        self.browser = browser
+        self.page_starts = [None]
 
-        # 配置表格
+        # 配置表格列，点击表头在SQL中排序
+        columns = browser.columns
         self.tree["columns"] = columns
         for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=120)
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=100)
+        self.filter_field["values"] = ["全文"] + columns
+        self.filter_field.set("全文")
+        self._show_page(token, page)
+
+    def _fetch_page(self, after):
+        """在后台读取after之后的一页"""
+        self.load_token += 1
+        token = self.load_token
+        future = self.db.submit(self.browser.fetch_page, after)
+        after_future(self, future, lambda page: self._show_page(token, page))
+
+    def _show_page(self, token, page):
+        if token != self.load_token:
+            return
+        rows, self.page_last, self.page_has_more = page
+        self.tree.set_rows(rows)
+        self.page_var.set(f"第{len(self.page_starts)}页" + ("" if self.page_has_more else "（末页）"))
+
+    def next_page(self):
+        if self.browser is None or not self.page_has_more:
+            return
+        self.page_starts.append(self.page_last)
+        self._fetch_page(self.page_last)
+
+    def prev_page(self):
+        if self.browser is None or len(self.page_starts) <= 1:
+            return
+        self.page_starts.pop()
+        self._fetch_page(self.page_starts[-1])
+
+    def sort_by(self, column):
+        """按列排序，再次点击同一列切换升序/降序"""
+        if self.browser is None:
+            return
+        descending = self.browser.sort_column == column and not self.browser.descending
+        self.browser.set_sort(column, descending)
+        self.page_starts = [None]
+        self._fetch_page(None)
+
+    # ----------------- XML表操作 -----------------
+    def load_xml_data(self):
+        """加载XML合同数据：文件变化时先导入contract表，再按数据库表分页浏览"""
+        token = self.load_token
+        future = self.db.submit(contract_store.sync, contract_store.CONTRACT_XML, self.db)
+
+        def on_synced(changed):
+            if token == self.load_token:
+                self.load_db_table(contract_store.CONTRACT_TABLE)
 
-        # 插入数据
-        for record in records:
-            values = [node.firstChild.data if node.firstChild else ""
-                      for node in record.childNodes if node.nodeType == node.ELEMENT_NODE]
-            self.tree.insert("", "end", values=values)
+        after_future(self, future, on_synced)
 
 
     # ----------------- JSON表操作 -----------------
     def load_json_data(self):
-        """加载JSON炼钢结果"""
-        with open("Data/result.json") as f:
-            data = json.load(f)
+        """加载JSON炼钢结果（解析在后台线程执行）"""
+        token = self.load_token
+        future = self.db.submit(self._read_file_table, self.table_config["steel_result"]["file"])
+
+        def on_loaded(model):
+            if token == self.load_token:
+                self._show_json_data(model)
+
+        after_future(self, future, on_loaded)
+
+    def _read_file_table(self, path):
+        """读取排程结果文件（在后台线程执行），解析为数据模型"""
+        from schedule_model import ScheduleModel  # 首次查看时才导入NumPy
+
+        data = JsonBlockJournal(path).load_data()
+        return ScheduleModel.from_blocks(data["block"], data.get("start_time", 0), data.get("machine"))
 
-        # 解析嵌套结构
-        blocks = data.get("block", [])
+    def _on_file_changed(self, table, result):
+        if self.table_var.get() != table:
+            return
+        self.load_token += 1
+        if table == "contract":
+            self.load_db_table(contract_store.CONTRACT_TABLE)
+        else:
+            self._show_json_data(result)
+
+    def _show_json_data(self, model):
         columns = ["machine", "start", "end", "cast", "charge"]
 
         self.tree["columns"] = columns
@@ -777,20 +534,12 @@ class DataManagementModule(tk.Frame):
             self.tree.heading(col, text=col)
             self.tree.column(col, width=100)
 
-        for block in blocks:
-            values = (
-                block.get("machine", ""),
-                block.get("start", ""),
-                block.get("end", ""),
-                block.get("cast", ""),
-                block.get("charge", "")
-            )
-            self.tree.insert("", "end", values=values)
+        self.tree.set_column_data([model.column(col) for col in columns])
 
 
     def init_tables(self):
         """初始化数据库表结构"""
-        with sqlite3.connect('steel_production.db') as conn:
+        with self.db.transaction() as conn:
             cursor = conn.cursor()
             # 浇次计划结果表
             cursor.execute('''CREATE TABLE IF NOT EXISTS cast_plan
@@ -807,39 +556,13 @@ class DataManagementModule(tk.Frame):
                              furnace_no TEXT UNIQUE,
                              width INTEGER,
                              status TEXT)''')
-            conn.commit()
-
-    def create_table(self):
-        """创建数据库表"""
-        cursor = self.db_conn.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS production_data
-                        (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                         order_no TEXT NOT NULL,
-                         furnace_no TEXT UNIQUE,
-                         width INTEGER,
-                         status TEXT CHECK(status IN ('计划', '进行中', '已完成')))''')
-        self.db_conn.commit()
-
-    def load_data(self, condition=None):
-        """加载数据到表格"""
-        # 清空现有数据
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # 执行查询
-        cursor = self.db_conn.cursor()
-        query = "SELECT * FROM production_data"
-        params = ()
-
-        if condition:
-            query += " WHERE " + condition
-            params = (f"%{self.search_entry.get()}%",)
-
-        cursor.execute(query, params)
-
-        # 插入数据
-        for row in cursor.fetchall():
-            self.tree.insert("", "end", values=row)
+        # 筛选索引与全文索引（首次建立可能较慢，在后台执行）
+        after_future(self, self.db.submit(ensure_indexes, self.db), self._on_indexes_ready)
+
+    def _on_indexes_ready(self, fts_tables):
+        self.fts_tables = fts_tables
+        if self.browser is not None:
+            self.browser.fts = self.browser.table in fts_tables
 
     def show_add_dialog(self):
         """显示添加记录对话框（增加类型检查）"""
@@ -903,8 +626,6 @@ class DataManagementModule(tk.Frame):
     def save_record(self, table_name, entries, dialog, fields):
         """动态生成SQL保存记录"""
         try:
-            cursor = self.db_conn.cursor()
-
             # 生成列名和值列表
             columns = [field[1] for field in fields]
             values = []
@@ -944,8 +665,7 @@ class DataManagementModule(tk.Frame):
                 sql = f"""INSERT INTO {table_name} 
                         ({','.join(columns)}) VALUES ({placeholders})"""
 
-            cursor.execute(sql, values)
-            self.db_conn.commit()
+            self.db.execute(sql, values)
 
             # 刷新数据
             self.load_current_data()
@@ -964,9 +684,10 @@ class DataManagementModule(tk.Frame):
         table_type = self.table_config[self.current_table]["type"]
         if table_type == "db":
             self._add_db_record()
-        else:
-            messagebox.showerror("操作禁止", "非数据库表不允许直接修改，请通过文件操作更新数据")
-            return
+        elif table_type == "xml":
+            self._add_xml_record()
+        elif table_type == "json":
+            self._add_json_record()
 
     def _add_db_record(self):
         """添加数据库记录"""
@@ -974,10 +695,7 @@ class DataManagementModule(tk.Frame):
         dialog.title("添加新记录")
 
         # 根据当前表获取字段信息
-        with sqlite3.connect('steel_production.db') as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"PRAGMA table_info({self.current_table})")
-            columns = [col[1] for col in cursor.fetchall() if col[1] != 'id']
+        columns = [col for col in self.db.columns(self.current_table) if col != 'id']
 
         entries = {}
         for idx, col in enumerate(columns):
@@ -992,23 +710,20 @@ class DataManagementModule(tk.Frame):
     def _save_db_record(self, dialog, entries, columns):
         """保存数据库记录"""
         try:
-            with sqlite3.connect('steel_production.db') as conn:
-                cursor = conn.cursor()
-                values = [entries[col].get() for col in columns]
-                placeholders = ",".join(["?"] * len(values))
-
-                # 处理不同表的插入语句
-                if self.current_table == "cast_plan":
-                    sql = f'''INSERT OR REPLACE INTO {self.current_table} 
-                            (heat_id, cast_no, charge_no, order_no, min_length, max_length)
-                            VALUES (?,?,?,?,?,?)'''
-                else:
-                    sql = f"INSERT INTO {self.current_table} ({','.join(columns)}) VALUES ({placeholders})"
+            values = [entries[col].get() for col in columns]
+            placeholders = ",".join(["?"] * len(values))
 
-                cursor.execute(sql, values)
-                conn.commit()
-                self.load_current_data()
-                dialog.destroy()
+            # 处理不同表的插入语句
+            if self.current_table == "cast_plan":
+                sql = f'''INSERT OR REPLACE INTO {self.current_table} 
+                        (heat_id, cast_no, charge_no, order_no, min_length, max_length)
+                        VALUES (?,?,?,?,?,?)'''
+            else:
+                sql = f"INSERT INTO {self.current_table} ({','.join(columns)}) VALUES ({placeholders})"
+
+            self.db.execute(sql, values)
+            self.load_current_data()
+            dialog.destroy()
         except Exception as e:
             messagebox.showerror("错误", f"保存失败: {str(e)}")
 
@@ -1034,24 +749,11 @@ class DataManagementModule(tk.Frame):
                    command=lambda: self._save_xml_record(dialog, entries)).grid(row=len(fields), columnspan=2)
 
     def _save_xml_record(self, dialog, entries):
-        """保存XML记录"""
+        """保存XML记录（追加到编辑日志，不改写原文件）"""
         try:
-            tree = ET.parse("FurnaceResult2.xml")
-            root = tree.getroot()
-
-            # 创建新节点
-            new_result = ET.SubElement(root, "FurnaceResult")
-            for tag, value in entries.items():
-                elem = ET.SubElement(new_result, tag)
-                elem.text = value.get()
-
-            # 美化XML格式
-            xml_str = ET.tostring(root, encoding="utf-8")
-            dom = parseString(xml_str)
-            with open("FurnaceResult2.xml", "w", encoding="utf-8") as f:
-                f.write(dom.toprettyxml(indent="  "))
-
-            self.load_current_data()
+            journal = XmlRecordJournal(contract_store.CONTRACT_XML)
+            journal.add({tag: value.get() for tag, value in entries.items()})
+            self._after_journal_edit(journal)
             dialog.destroy()
         except Exception as e:
             messagebox.showerror("错误", f"保存失败: {str(e)}")
@@ -1074,26 +776,37 @@ class DataManagementModule(tk.Frame):
                    command=lambda: self._save_json_record(dialog, entries)).grid(row=len(fields), columnspan=2)
 
     def _save_json_record(self, dialog, entries):
-        """保存JSON记录"""
+        """保存JSON记录（追加到编辑日志，不改写原文件）"""
         try:
-            with open("Data/result.json", "r+") as f:
-                data = json.load(f)
-                new_block = {k: v.get() for k, v in entries.items()}
-                data["block"].append(new_block)
-                f.seek(0)
-                json.dump(data, f, indent=2)
-                f.truncate()
-
-            self.load_current_data()
+            journal = JsonBlockJournal(self.table_config["steel_result"]["file"])
+            journal.add({k: v.get() for k, v in entries.items()})
+            self._after_journal_edit(journal)
             dialog.destroy()
         except Exception as e:
             messagebox.showerror("错误", f"保存失败: {str(e)}")
 
+    def _after_journal_edit(self, journal):
+        """刷新显示，日志过大时在后台合并回原文件"""
+        self.load_current_data()
+        if journal.needs_compaction():
+            after_future(self, self.db.submit(journal.compact), lambda count: None)
+
+    def compact_journals(self):
+        """把XML与JSON的编辑日志合并回原文件"""
+        journals = [XmlRecordJournal(contract_store.CONTRACT_XML),
+                    JsonBlockJournal(self.table_config["steel_result"]["file"])]
+        future = self.db.submit(lambda: sum(journal.compact() for journal in journals))
+
+        def on_done(count):
+            self.load_current_data()
+            messagebox.showinfo("完成", f"已合并{count}条编辑")
+
+        after_future(self, future, on_done, lambda e: messagebox.showerror("错误", f"合并失败: {str(e)}"))
+
     def update_record(self, record_id, entries, dialog):
         """更新数据库记录"""
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute('''UPDATE production SET
+            self.db.execute('''UPDATE production SET
                             order_no = ?,
                             furnace_no = ?,
                             weight = ?,
@@ -1106,74 +819,46 @@ class DataManagementModule(tk.Frame):
                             int(entries["width"].get()),
                             entries["status"].get(),
                             record_id))
-            self.db_conn.commit()
-            self.load_data()
+            self.load_current_data()
             dialog.destroy()
         except Exception as e:
             messagebox.showerror("错误", f"更新失败: {str(e)}")
 
     def _delete_xml_record(self, selected_items):
-        """删除XML记录"""
+        """删除XML记录（追加到编辑日志，不改写原文件）"""
         try:
-            dom = minidom.parse("FurnaceResult2.xml")
-            root = dom.documentElement
-
-            # 构建索引
-            records = root.getElementsByTagName("FurnaceResult")
-            indexes = [int(i) for i in selected_items]
-
-            # 逆序删除避免索引错位
-            for idx in sorted(indexes, reverse=True):
-                node = records[idx]
-                root.removeChild(node)
-
-            # 美化保存
-            with open("FurnaceResult2.xml", "w", encoding="utf-8") as f:
-                dom.writexml(f, indent="  ", addindent="  ", newl="\n")
-
-            self.load_current_data()
+            # 第一列为row_no，换算为记录列表中的下标
+            row_nos = [self.tree.row(index)[0] for index in selected_items]
+            journal = XmlRecordJournal(contract_store.CONTRACT_XML)
+            journal.delete(contract_store.positions(row_nos, self.db))
+            self._after_journal_edit(journal)
         except Exception as e:
             messagebox.showerror("错误", f"XML删除失败: {str(e)}")
 
     def _delete_json_record(self, selected_items):
-        """删除JSON记录"""
+        """删除JSON记录（追加到编辑日志，不改写原文件）"""
         try:
-            with open("Data/result.json", "r+") as f:
-                data = json.load(f)
-                indexes = [int(i) for i in selected_items]
-
-                # 逆序删除
-                for idx in sorted(indexes, reverse=True):
-                    del data["block"][idx]
-
-                f.seek(0)
-                json.dump(data, f, indent=2)
-                f.truncate()
-
-            self.load_current_data()
+            journal = JsonBlockJournal(self.table_config["steel_result"]["file"])
+            journal.delete(int(i) for i in selected_items)
+            self._after_journal_edit(journal)
         except Exception as e:
             messagebox.showerror("错误", f"JSON删除失败: {str(e)}")
-    def search_data(self):
-        """执行搜索"""
-        field_map = {
-            "订单号": "order_no",
-            "炉号": "furnace_no"
-        }
-
-        field = field_map.get(self.search_field.get(), "order_no")
-        keyword = self.search_entry.get()
-
-        if keyword:
-            self.load_data(f"{field} LIKE ?")
-        else:
-            self.load_data()
-
 
+    def search_data(self):
+        """按筛选条件重新查询：选择列时按前缀筛选，选择全文时做子串检索"""
+        if self.browser is None:
+            messagebox.showinfo("提示", "仅数据库表支持筛选")
+            return
+        field = self.filter_field.get()
+        self.browser.set_filter(None if field in ("", "全文") else field, self.search_entry.get())
+        self.page_starts = [None]
+        self._fetch_page(None)
 
 
 class MainApplication(tk.Tk):
-    def __init__(self):
+    def __init__(self, profile=None):
         super().__init__()
+        self.profile = profile or StartupProfile()
         self.title("钢铁生产管理系统")
         self.geometry("800x600")
 
@@ -1186,6 +871,8 @@ class MainApplication(tk.Tk):
 
         # 初始化各模块
         self.create_modules()
+        self.profile.mark("窗口创建")
+        self.after_idle(self.profile.mark, "窗口可交互")
 
     def init_style(self):
         """初始化界面样式"""
@@ -1201,20 +888,45 @@ class MainApplication(tk.Tk):
                   background=[("selected", "#4B8BBE")],)
 
     def create_modules(self):
-        """创建三个模块并设置不同配色方案"""
-        # 模块1：组炉组浇（蓝色系）
-        # 组炉组浇模块（蓝色系）
-        self.module1 = FurnacePlanningModule(self.notebook)
-        self.notebook.add(self.module1, text="组炉组浇")
+        """添加三个标签页，各模块在标签页首次被选中时才创建"""
+        self.module1 = self.module2 = self.module3 = None
+        self.pending_tabs = {}  # 尚未创建模块的标签页 -> (标题, 创建函数)
+        for title, factory in (("组炉组浇", self.create_furnace_module),
+                               ("炼钢连铸", self.create_steel_module),
+                               ("数据管理", self.create_data_module)):
+            page = ttk.Frame(self.notebook)
+            self.notebook.add(page, text=title)
+            self.pending_tabs[str(page)] = (title, factory)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+    def on_tab_changed(self, event=None):
+        page = self.notebook.select()
+        if page not in self.pending_tabs:
+            return
+        title, factory = self.pending_tabs.pop(page)
+        self.configure(cursor="watch")
+        self.update_idletasks()
+        try:
+            with self.profile.measure(f"创建{title}模块"):
+                factory(self.nametowidget(page)).pack(expand=True, fill="both")
+        finally:
+            self.configure(cursor="")
+
+    # 模块1：组炉组浇（蓝色系）
+    def create_furnace_module(self, parent):
+        self.module1 = FurnacePlanningModule(parent)
+        return self.module1
 
-        # 模块2：炼钢连铸（绿色系）
-        self.module2 = SteelCastingModule(self.notebook)
-        self.notebook.add(self.module2, text="炼钢连铸")
+    # 模块2：炼钢连铸（绿色系）
+    def create_steel_module(self, parent):
+        from steel_casting import SteelCastingModule  # 首次打开时才导入matplotlib与NumPy
+        self.module2 = SteelCastingModule(parent)
+        return self.module2
 
-        # 模块3：数据管理（橙色系）
-        # 数据管理模块（新实现）
-        self.module3 = DataManagementModule(self.notebook)
-        self.notebook.add(self.module3, text="数据管理")
+    # 模块3：数据管理（橙色系）
+    def create_data_module(self, parent):
+        self.module3 = DataManagementModule(parent)
+        return self.module3
 
 
 class ModuleBase(tk.Frame):
@@ -1256,5 +968,8 @@ class ModuleBase(tk.Frame):
 
 
 if __name__ == "__main__":
-    app = MainApplication()
+    # --profile-startup或环境变量STARTUP_PROFILE=1时输出启动各阶段耗时
+    profile = StartupProfile(STARTED, "--profile-startup" in sys.argv or bool(os.environ.get("STARTUP_PROFILE")))
+    profile.mark("模块导入")
+    app = MainApplication(profile)
     app.mainloop()
\ No newline at end of file
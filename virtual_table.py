@@ -0,0 +1,303 @@
+# virtual_table.py
+from tkinter import ttk
+
+SHIFT_MASK = 0x0001    # 事件state中的Shift键
+CONTROL_MASK = 0x0004  # 事件state中的Ctrl键
+
+
+class VirtualTable(ttk.Frame):
+    """虚拟化表格控件
+
+    数据按列保存在Python侧（每列一个序列，可以是list或NumPy数组），
+    Treeview中只保留与可视区域行数相同的条目，滚动时复用这些条目
+    重新填充内容，因此Tk条目数量与数据量无关。
+
+    对外接口尽量与ttk.Treeview保持一致：heading/column/tag_configure
+    直接转发，selection()返回的是数据行号，选中变化时在本控件上
+    触发<<TreeviewSelect>>虚拟事件。
+    """
+
+    def __init__(self, parent, columns=(), show="headings", stripe_tags=None, row_tags=None,
+                 selectmode="extended"):
+        super().__init__(parent)
+        self.stripe_tags = stripe_tags  # 交替行标签，如("evenrow", "oddrow")
+        self.row_tags = row_tags        # 按行号返回附加标签的函数
+
+        self.tree = ttk.Treeview(self, columns=columns, show=show, selectmode=selectmode)
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.hsb.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        self.hsb.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self._columns = list(columns)
+        self._data = [[] for _ in self._columns]
+        self._count = 0
+        self._top = 0             # 可视区域第一行对应的数据行号
+        self._page = 1            # 可视区域可容纳的行数
+        self._pool = []           # 复用的Tk条目ID
+        self._item_index = {}     # Tk条目ID -> 数据行号
+        self._selected = set()    # 选中的数据行号
+        self._expected_selection = set()  # 渲染时设置的Treeview选中条目
+        self._extend_selection = False    # 最近一次点击是否按住Ctrl/Shift（追加选择）
+        self._render_job = None
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<ButtonPress-1>", self._on_click, add="+")
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.yview_scroll(-3, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.yview_scroll(3, "units"))
+        self.tree.bind("<Up>", lambda e: self._move_cursor(-1))
+        self.tree.bind("<Down>", lambda e: self._move_cursor(1))
+        self.tree.bind("<Prior>", lambda e: self._move_cursor(-self._page))
+        self.tree.bind("<Next>", lambda e: self._move_cursor(self._page))
+        self.tree.bind("<Home>", lambda e: self._move_cursor(-self._count))
+        self.tree.bind("<End>", lambda e: self._move_cursor(self._count))
+
+    # ----------------- 列与样式配置 -----------------
+    def __setitem__(self, key, value):
+        if key == "columns":
+            self.set_columns(value)
+        else:
+            super().__setitem__(key, value)
+
+    def set_columns(self, columns):
+        """重新设置列定义，同时清空数据"""
+        self._columns = list(columns)
+        self.tree["columns"] = self._columns
+        self.clear()
+
+    def heading(self, column, **kw):
+        return self.tree.heading(column, **kw)
+
+    def column(self, column, **kw):
+        return self.tree.column(column, **kw)
+
+    def tag_configure(self, tagname, **kw):
+        return self.tree.tag_configure(tagname, **kw)
+
+    # ----------------- 数据操作 -----------------
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        """清空数据与Tk条目"""
+        self._data = [[] for _ in self._columns]
+        self._count = 0
+        self._top = 0
+        self._selected.clear()
+        self.tree.delete(*self._pool)
+        self._pool = []
+        self._item_index = {}
+        self._update_scrollbar()
+
+    def set_rows(self, rows):
+        """按行设置数据（行为与列顺序一致的元组）"""
+        rows = list(rows)
+        width = len(self._columns)
+        data = [[row[i] if i < len(row) else "" for row in rows] for i in range(width)]
+        self.set_column_data(data)
+
+    def set_column_data(self, data, keep_view=False):
+        """直接按列设置数据，各列需等长，支持list或NumPy数组
+
+        keep_view为True时保留滚动位置与选中行（用于行顺序不变的原地更新）。
+        """
+        if len(data) != len(self._columns):
+            raise ValueError("列数据数量与列定义不一致")
+        self._data = list(data)
+        self._count = len(data[0]) if data else 0
+        if keep_view:
+            self._selected = {i for i in self._selected if i < self._count}
+        else:
+            self._top = 0
+            self._selected.clear()
+        self.refresh()
+
+    def append_rows(self, rows):
+        """追加多行数据"""
+        self._data = [col if isinstance(col, list) else list(col) for col in self._data]
+        added = 0
+        for row in rows:
+            for col, value in zip(self._data, row):
+                col.append(value)
+            added += 1
+        if added:
+            self._count += added
+            self._schedule_render()
+
+    def row(self, index):
+        """返回指定数据行的值元组"""
+        return tuple(_plain(col[index]) for col in self._data)
+
+    def get_children(self):
+        """兼容Treeview接口：返回全部数据行号"""
+        return range(self._count)
+
+    def delete(self, *items):
+        """兼容Treeview接口：传入全部行号时清空表格，否则删除指定行"""
+        if not items:
+            return
+        if len(items) == self._count:
+            self.clear()
+            return
+        drop = set(items)
+        keep = [i for i in range(self._count) if i not in drop]
+        self.set_column_data([[col[i] for i in keep] for col in self._data])
+
+    # ----------------- 选中状态 -----------------
+    def selection(self):
+        """返回选中的数据行号（升序）"""
+        return sorted(self._selected)
+
+    def selection_set(self, indices):
+        self._selected = {i for i in indices if 0 <= i < self._count}
+        self._render()
+        self.event_generate("<<TreeviewSelect>>")
+
+    def see(self, index):
+        """滚动到指定数据行"""
+        if index < self._top:
+            self._set_top(index)
+        elif index >= self._top + self._page:
+            self._set_top(index - self._page + 1)
+
+    # ----------------- 渲染 -----------------
+    def refresh(self):
+        """重新填充可视区域（数据或行标签变化后调用）"""
+        self._render()
+
+    def _schedule_render(self):
+        if self._render_job is None:
+            self._render_job = self.after_idle(self._render)
+
+    def _row_tags(self, index):
+        tags = ()
+        if self.stripe_tags:
+            tags = (self.stripe_tags[index % len(self.stripe_tags)],)
+        if self.row_tags:
+            tags += tuple(self.row_tags(index))
+        return tags
+
+    def _render(self):
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+
+        self._top = max(0, min(self._top, self._count - self._page))
+        needed = max(0, min(self._page, self._count - self._top))
+
+        # 条目不足时补充，多余时删除
+        while len(self._pool) < needed:
+            self._pool.append(self.tree.insert("", "end"))
+        if len(self._pool) > needed:
+            self.tree.delete(*self._pool[needed:])
+            del self._pool[needed:]
+
+        self._item_index = {}
+        visible_selected = []
+        for offset, iid in enumerate(self._pool):
+            index = self._top + offset
+            self.tree.item(iid, values=self.row(index), tags=self._row_tags(index))
+            self._item_index[iid] = index
+            if index in self._selected:
+                visible_selected.append(iid)
+
+        self._expected_selection = set(visible_selected)
+        self.tree.selection_set(visible_selected)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self._count == 0:
+            self.vsb.set(0.0, 1.0)
+            return
+        first = self._top / self._count
+        last = min(1.0, (self._top + self._page) / self._count)
+        self.vsb.set(first, last)
+
+    # ----------------- 滚动 -----------------
+    def _set_top(self, top):
+        top = max(0, min(int(top), self._count - self._page))
+        if top != self._top:
+            self._top = top
+            self._render()
+
+    def yview_scroll(self, number, what):
+        step = self._page if what == "pages" else 1
+        self._set_top(self._top + int(number) * step)
+
+    def yview_moveto(self, fraction):
+        self._set_top(float(fraction) * self._count)
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.yview_moveto(args[0])
+        elif action == "scroll":
+            self.yview_scroll(args[0], args[1])
+
+    def _on_mousewheel(self, event):
+        self.yview_scroll(-3 if event.delta > 0 else 3, "units")
+        return "break"
+
+    def _move_cursor(self, step):
+        """键盘移动选中行，必要时滚动"""
+        if not self._count:
+            return "break"
+        current = self.tree.focus()
+        index = self._item_index.get(current, self._top)
+        index = max(0, min(self._count - 1, index + step))
+        self.see(index)
+        self._selected = {index}
+        self._render()
+        iid = self._pool[index - self._top]
+        self.tree.focus(iid)
+        self.event_generate("<<TreeviewSelect>>")
+        return "break"
+
+    def _on_resize(self, event=None):
+        """根据控件高度计算可视行数"""
+        row_height, header = self._row_metrics()
+        page = max(1, (self.tree.winfo_height() - header) // row_height)
+        if page != self._page:
+            self._page = page
+            self._render()
+
+    def _row_metrics(self):
+        """返回(行高, 表头高度)，优先使用已有条目的实际尺寸"""
+        if self._pool:
+            bbox = self.tree.bbox(self._pool[0])
+            if bbox:
+                return max(1, bbox[3]), bbox[1]
+        style = ttk.Style(self)
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        return row_height, row_height + 4
+
+    def _on_click(self, event):
+        self._extend_selection = bool(event.state & (CONTROL_MASK | SHIFT_MASK))
+
+    def _on_tree_select(self, event):
+        """把Treeview条目的选中状态同步回数据行号
+
+        Treeview只知道可视区域内的条目：按住Ctrl/Shift追加选择时只更新可视区域
+        内的行，保留滚出可视区域的选中行；普通点击则替换全部选中行。
+        """
+        current = set(self.tree.selection())
+        if current == self._expected_selection:
+            return  # 渲染时设置选中状态引起的回调
+        self._expected_selection = current
+        visible = {self._item_index[iid] for iid in current if iid in self._item_index}
+        if self._extend_selection:
+            self._selected = (self._selected - set(self._item_index.values())) | visible
+        else:
+            self._selected = visible
+        self.event_generate("<<TreeviewSelect>>")
+
+
+def _plain(value):
+    """NumPy标量转换为Python内置类型，便于Tk显示"""
+    return value.item() if hasattr(value, "item") else value